@@ -1,8 +1,8 @@
-import os, yaml, streamlit as st, streamlit_authenticator as stauth
-import requests
-from io import StringIO
-import pandas as pd
-from yaml.loader import SafeLoader
+import copy
+import os
+import streamlit as st
+
+from dashboard.perf import track_session
 
 # Prefer ENV; allow inline only as a local fallback
 INLINE_AUTH_YAML = """
@@ -24,25 +24,41 @@ preauthorized:
 
 auth_yaml = os.getenv("AUTH_CONFIG_YAML", INLINE_AUTH_YAML).strip()
 
+
+@st.cache_resource
+def load_auth_config(auth_yaml):
+    # Parsed once per process; yaml is only needed here
+    import yaml
+    return yaml.safe_load(auth_yaml)
+
+
+def get_authenticator(config):
+    # One authenticator per browser session, reused across reruns
+    if "authenticator" not in st.session_state:
+        import streamlit_authenticator as stauth
+        st.session_state["authenticator"] = stauth.Authenticate(
+            copy.deepcopy(config["credentials"]),  # it updates credentials in place; keep sessions apart
+            config["cookie"]["name"],
+            config["cookie"]["key"],
+            cookie_expiry_days=config["cookie"]["expiry_days"],
+            auto_hash=False,  # you already provided bcrypt hashes
+            # The re-login cookie is read from the request headers, so there is
+            # nothing to wait for before showing the form (default sleep is 0.7s)
+            login_sleep_time=0,
+        )
+    return st.session_state["authenticator"]
+
+
 try:
-    config = yaml.load(auth_yaml, Loader=SafeLoader)
+    config = load_auth_config(auth_yaml)
 except Exception as e:
     st.error(f"Auth config error: {e}")
     st.stop()
 
-authenticator = stauth.Authenticate(
-    config["credentials"],
-    config["cookie"]["name"],
-    config["cookie"]["key"],
-    cookie_expiry_days=config["cookie"]["expiry_days"],
-    auto_hash=False,  # you already provided bcrypt hashes
-)
+authenticator = get_authenticator(config)
 
 # ---- Simple login UI ----
-if "auth_status" not in st.session_state:
-    st.session_state["auth_status"] = None
-
-result = authenticator.login(
+authenticator.login(
     location="main",
     fields={
         "Form name": "Login",
@@ -52,12 +68,9 @@ result = authenticator.login(
     },
 )
 
-# Newer versions should return a tuple, but guard just in case
-if result is None:
-    st.stop()
-
-name, auth_status, username = result
-st.session_state["authentication_status"] = auth_status  # optional: used by sub-pages
+# The authenticator keeps name/authentication_status/username in session state,
+# which the sub-pages read as well
+auth_status = st.session_state.get("authentication_status")
 
 if auth_status is False:
     st.error("Invalid username or password")
@@ -72,6 +85,6 @@ else:
 # === Done ===
 
 st.set_page_config(page_title="UC Sustainable Procurement Dashboard", layout="wide")
+track_session("Home")
 
 st.sidebar.success("Select from the choices above")
-
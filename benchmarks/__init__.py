@@ -0,0 +1 @@
+"""Headless page benchmarks on synthetic data; see benchmarks/run_pages.py."""
@@ -0,0 +1,258 @@
+"""Run every page headlessly against synthetic sheets of several sizes.
+
+For each size a synthetic sheet (benchmarks/synthetic.py) is written to the
+data directory and served over a local HTTP server, which stands in for the
+Google Sheets export URL. Each size then runs in a fresh interpreter with
+its own cache directory, so every number is a cold start:
+
+- load: fetch, parse and schema the sheet (the refresher's ingest path)
+- prepare: build the indexes, certification tables and derived columns
+- render: first run of each page with Streamlit's AppTest
+- filter: one rerun per entry of the fixed sidebar filter matrix
+
+Peak memory comes from tracemalloc in a second, separate pass, because
+tracing slows everything down and would distort the timings.
+
+    python -m benchmarks.run_pages
+    python -m benchmarks.run_pages --rows 1000 100000 --json results.json
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SIZES = [1_000, 100_000, 1_000_000]
+PAGES = [
+    "app.py",
+    "pages/1_Start_Here.py",
+    "pages/2_Category_Explorer.py",
+    "pages/3_Distributor_and_Supplier_View.py",
+    "pages/4_Sustainability_Stats.py",
+    "pages/5_Campus_Overlap.py",
+]
+EXPLORER = "pages/2_Category_Explorer.py"
+ENTITIES = "pages/3_Distributor_and_Supplier_View.py"
+
+# Sidebar widgets of the Explorer, by label, and their default values
+EXPLORER_DEFAULTS = {
+    "Search products, suppliers or distributors": "",
+    "Standards Aggregator": "Both",
+    "Food Categories": [],
+    "Regions": [],
+    "Campuses": [],
+    "Match campuses": "Any (OR)",
+    "Sustainability Standards": [],
+    "Match standards": "Any (OR)",
+    "Exclude Categories": [],
+    "Exclude Campuses": [],
+    "Exclude Standards": [],
+}
+
+# Fixed filter matrix; each entry is applied on top of the defaults. Labels that
+# aren't sidebar filters belong to the product table and are set after a plain rerun.
+EXPLORER_MATRIX = {
+    "defaults": {},
+    "aggregator": {"Standards Aggregator": "AASHE STARS"},
+    "category": {"Food Categories": ["Produce"]},
+    "category+region": {"Food Categories": ["Produce"], "Regions": ["NorCal"]},
+    "campus+cert": {"Campuses": ["UCLA"], "Sustainability Standards": ["OG"]},
+    "all filters": {
+        "Standards Aggregator": "Practice Greenhealth",
+        "Food Categories": ["Coffee/Tea"],
+        "Regions": ["SoCal"],
+        "Campuses": ["UCSD_H"],
+        "Sustainability Standards": ["FT"],
+    },
+    "boolean query": {
+        "Sustainability Standards": ["OG", "FT"],
+        "Regions": ["NorCal"],
+        "Exclude Categories": ["Soda"],
+    },
+    "all-of query": {
+        "Food Categories": ["Produce", "Milk", "Snacks"],
+        "Campuses": ["UCLA", "UCB"],
+        "Match campuses": "All (AND)",
+        "Sustainability Standards": ["OG", "FT"],
+        "Match standards": "All (AND)",
+        "Exclude Campuses": ["UCM"],
+        "Exclude Standards": ["RAC"],
+    },
+    "search": {"Search products, suppliers or distributors": "organic milk"},
+    "search+category": {"Search products, suppliers or distributors": "kombucha", "Food Categories": ["Kombucha"]},
+    "sort by name": {"Sort by": "ProductName"},  # keep last: the defaults don't reset the table's sort
+}
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(directory):
+    """Serve ``directory`` on a free localhost port; returns the base URL."""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+# ---- Worker: runs inside a fresh interpreter pointed at one synthetic sheet ----
+
+class _Recorder:
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.results = []
+
+    def measure(self, stage, name, fn):
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - start
+        record = {"stage": stage, "name": name}
+        if self.trace_memory:
+            record["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+        else:
+            record["seconds"] = seconds
+        self.results.append(record)
+        return value
+
+
+def _app_test(page, logged_in=True):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / page), default_timeout=600)
+    if logged_in:
+        at.session_state["authentication_status"] = True
+        at.session_state["username"] = "analyst"
+    return at
+
+
+def _run(at):
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"page raised: {[e.value for e in at.exception]}")
+    return at
+
+
+def _set_widget(at, label, value):
+    for widget in list(at.selectbox) + list(at.multiselect) + list(at.radio) + list(at.text_input):
+        if widget.label == label:
+            widget.set_value(value)
+            return
+    raise KeyError(f"no widget labelled {label!r}")
+
+
+def _worker(trace_memory):
+    from dashboard.data import save_snapshot
+    from dashboard.dataset import get_dataset
+    from dashboard.ingest import fetch_update
+
+    recorder = _Recorder(trace_memory)
+
+    # Seed the snapshot the way the background refresher would, then build the shared dataset
+    df, meta = recorder.measure("load", "fetch + parse", lambda: fetch_update({}))
+    save_snapshot(df, meta)
+    del df
+    dataset = recorder.measure("prepare", "indexes + tables", get_dataset)
+
+    for page in PAGES:
+        at = _app_test(page, logged_in=page != "app.py")
+        recorder.measure("render", page, lambda: _run(at))
+
+    at = _run(_app_test(EXPLORER))
+    for name, filters in EXPLORER_MATRIX.items():
+        for label, default in EXPLORER_DEFAULTS.items():
+            _set_widget(at, label, filters.get(label, default))
+        table_widgets = {label: value for label, value in filters.items() if label not in EXPLORER_DEFAULTS}
+        if table_widgets:
+            _run(at)  # the table's own widgets only exist once the filtered table is shown
+            for label, value in table_widgets.items():
+                _set_widget(at, label, value)
+        recorder.measure("filter", f"explorer: {name}", lambda: _run(at))
+
+    # The largest distributor and supplier are the worst case for the entity view
+    entities = dataset.entity_index
+    distributor = max(entities.distributors.values(), key=lambda e: len(e.positions)).name
+    supplier = max(entities.suppliers.values(), key=lambda e: len(e.positions)).name
+    at = _run(_app_test(ENTITIES))
+    at.selectbox(key="distributor_select").set_value(distributor)
+    recorder.measure("filter", "entities: largest distributor", lambda: _run(at))
+    at.selectbox(key="supplier_select").set_value(supplier)
+    recorder.measure("filter", "entities: largest supplier", lambda: _run(at))
+
+    print(json.dumps(recorder.results))
+
+
+# ---- Driver ----
+
+def run_size(rows, data_dir, base_url, trace_memory):
+    from benchmarks.synthetic import write_csv
+
+    sheet = data_dir / f"products_{rows}.csv"
+    if not sheet.exists():
+        write_csv(rows, sheet)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(
+            os.environ,
+            DASHBOARD_SHEET_URL=f"{base_url}/{sheet.name}",
+            DASHBOARD_CACHE_DIR=cache_dir,
+            DASHBOARD_SOURCES=str(Path(cache_dir) / "no-sources.yaml"),  # single-sheet mode
+            DASHBOARD_SNAPSHOT_TTL="86400",  # keep the refresher quiet during the run
+        )
+        command = [sys.executable, "-m", "benchmarks.run_pages", "--worker"]
+        if trace_memory:
+            command.append("--trace-memory")
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{rows} rows failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "dashboard-benchmarks",
+                        help="where synthetic sheets are written and reused between runs")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--trace-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.trace_memory)
+        return
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    base_url = serve(args.data_dir)
+    report = []
+    for rows in args.rows:
+        timings = run_size(rows, args.data_dir, base_url, trace_memory=False)
+        memory = [{}] * len(timings) if args.no_memory else run_size(rows, args.data_dir, base_url, trace_memory=True)
+        print(f"\n{rows:,} rows")
+        print(f"  {'stage':8} {'step':42} {'seconds':>8} {'peak MB':>8}")
+        for timing, traced in zip(timings, memory):
+            entry = dict(timing, rows=rows, peak_mb=traced.get("peak_mb"))
+            report.append(entry)
+            peak = f"{entry['peak_mb']:8.1f}" if entry["peak_mb"] is not None else f"{'-':>8}"
+            print(f"  {entry['stage']:8} {entry['name']:42} {entry['seconds']:8.3f} {peak}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
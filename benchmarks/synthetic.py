@@ -0,0 +1,78 @@
+"""Synthetic product sheets with the same columns as the Google Sheet.
+
+Categories, distributors, suppliers, standards and product names are drawn
+from the bundled Data_for_dashboard.csv with its own frequencies, so filters
+select realistic fractions of the rows. Suppliers and product names are
+extended with numbered variants as the row count grows, so the search and
+entity indexes scale the way a larger catalog would. Flags use the sheet's
+encoding: 1 for yes, blank for no.
+
+    python -m benchmarks.synthetic 100000 /tmp/products_100k.csv
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dashboard.campuses import campus_cols
+from dashboard.certifications import sustainability_dict
+from dashboard.data import BUNDLED_CSV
+
+TEXT_COLUMNS = ["Distributor", "Supplier", "ProductName", "Category", "Standard", "Internal_ID_Reference_Number"]
+AGGREGATOR_COLUMNS = ["AASHE", "PGH"]
+COLUMNS = TEXT_COLUMNS + campus_cols + list(sustainability_dict) + AGGREGATOR_COLUMNS
+
+ROWS_PER_SUPPLIER = 40
+CAMPUS_RATE = 0.2
+AGGREGATOR_RATES = {"AASHE": 0.6, "PGH": 0.35}
+PACK_SIZES = ["", "12OZ", "1LB", "5LB", "CS/12", "6/32OZ", "4/1GAL", "10LB", "24CT"]
+
+
+def _draw(rng, series, n):
+    # Sample values with the frequencies they have in the seed sheet
+    counts = series.dropna().value_counts()
+    return rng.choice(counts.index.to_numpy(dtype=object), size=n, p=(counts / counts.sum()).to_numpy())
+
+
+def _numbered(rng, base, n, pool_size):
+    # Widen a small seed vocabulary to ``pool_size`` distinct names by numbering variants
+    variant = rng.integers(0, max(1, pool_size // max(1, len(np.unique(base)))), size=n)
+    return np.where(variant == 0, base, base + " " + variant.astype(str)).astype(object)
+
+
+def generate(rows, seed=0):
+    """A DataFrame of ``rows`` synthetic products in the sheet's column layout."""
+    rng = np.random.default_rng(seed)
+    sheet = pd.read_csv(BUNDLED_CSV, dtype=str)
+
+    frame = pd.DataFrame({
+        "Distributor": _draw(rng, sheet["Distributor"], rows),
+        "Supplier": _numbered(rng, _draw(rng, sheet["Supplier"], rows), rows, max(1, rows // ROWS_PER_SUPPLIER)),
+        "ProductName": _draw(rng, sheet["ProductName"], rows) + " " + rng.choice(PACK_SIZES, size=rows),
+        "Category": _draw(rng, sheet["Category"], rows),
+        "Standard": _draw(rng, sheet["Standard"], rows),
+        "Internal_ID_Reference_Number": rng.integers(10_000, 10_000_000, size=rows).astype(str),
+    })
+    frame["ProductName"] = _numbered(rng, frame["ProductName"].str.strip().to_numpy(dtype=object), rows, rows)
+
+    # Every product is bought by at least one campus, and most carry one or two certifications
+    campuses = rng.random((rows, len(campus_cols))) < CAMPUS_RATE
+    campuses[np.arange(rows), rng.integers(0, len(campus_cols), size=rows)] = True
+    certs = np.zeros((rows, len(sustainability_dict)), dtype=bool)
+    weights = np.linspace(2, 0.1, len(sustainability_dict))  # OG is by far the most common, as in the sheet
+    for _ in range(2):
+        certs[np.arange(rows), rng.choice(len(sustainability_dict), size=rows, p=weights / weights.sum())] = True
+    aggregators = np.column_stack([rng.random(rows) < AGGREGATOR_RATES[c] for c in AGGREGATOR_COLUMNS])
+
+    flags = np.hstack([campuses, certs, aggregators])
+    flag_frame = pd.DataFrame(np.where(flags, "1", ""), columns=campus_cols + list(sustainability_dict) + AGGREGATOR_COLUMNS)
+    return pd.concat([frame, flag_frame], axis=1)[COLUMNS]
+
+
+def write_csv(rows, path, seed=0):
+    generate(rows, seed).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    write_csv(int(sys.argv[1]), sys.argv[2])
@@ -0,0 +1,79 @@
+"""Campus metadata and the derived campus columns shown on the pages."""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Region mapping
+region_map = {
+    "SoCal": ["UCLA", "UCR","UCSD_H","UCLA_H"],
+    "Central": ["UCM"],
+    "NorCal": ["UCB", "UCD_H", "UCSC","UCD"]
+}
+
+campus_cols = ['UCLA', 'UCD_H', 'UCB', 'UCR', 'UCM', 'UCSC','UCSD_H','UCLA_H','UCD']
+campus_contacts = {
+    "UCLA": "UCLA - Jane Doe (jane.doe@ucla.edu)",
+    "UCD_H": "UC Davis Health - Jane Doe (jane.doe@ucla.edu)",
+    "UCB": "UC Berkeley - Jane Doe (jane.doe@ucla.edu)",
+    "UCR": "UC Riverside - Jane Doe (jane.doe@ucla.edu)",
+    "UCM": "UC Merced - Jane Doe (jane.doe@ucla.edu)",
+    "UCSC": "UC Santa Cruz - Jane Doe (jane.doe@ucla.edu)",
+    "UCSD_H": "UC San Diego Health - Jane Doe (jane.doe@ucla.edu)",
+    "UCLA_H": "UCLA Health - Jane Doe (jane.doe@ucla.edu)",
+    "UCD": "UC Davis - Jane Doe (jane.doe@ucla.edu)"
+}
+
+campus_name_map = {
+    "UCLA": "UCLA",
+    "UCD_H": "UC Davis Health",
+    "UCB": "UC Berkeley",
+    "UCR": "UC Riverside",
+    "UCM": "UC Merced",
+    "UCSC": "UC Santa Cruz",
+    "UCSD_H": "UC San Diego Health",
+    "UCLA_H": "UCLA Health",
+    "UCD": "UC Davis"
+}
+
+
+def campus_mask(df):
+    """One integer per row with bit i set when ``campus_cols[i]`` procures it.
+
+    The campus flags are already packed this way at ingest (see dashboard.schema).
+    """
+    return df["campus_bits"].to_numpy().astype(np.uint32)
+
+
+@lru_cache(maxsize=None)
+def _label_table(labels):
+    # One precomputed string per possible mask, so labelling a column is a single take
+    return np.array(
+        [", ".join(labels[bit] for bit in range(len(labels)) if m >> bit & 1) for m in range(1 << len(labels))],
+        dtype=object,
+    )
+
+
+def mask_labels(mask, labels):
+    """Label each row mask with the joined ``labels`` of its set bits.
+
+    Returned as a categorical over the label table, so no per-row strings are built.
+    """
+    labels = tuple(labels)
+    if len(labels) <= 16:
+        return pd.Categorical.from_codes(mask.astype(np.int32), categories=_label_table(labels))
+    # Too many campuses for a dense table: only label the masks that occur
+    uniques, inverse = np.unique(mask, return_inverse=True)
+    table = [", ".join(labels[bit] for bit in range(len(labels)) if m >> bit & 1) for m in uniques]
+    return pd.Categorical.from_codes(inverse, categories=table)
+
+
+def add_campus_columns(df):
+    """A new frame with the derived campus label columns, and the campus mask; ``df`` is left as is."""
+    mask = campus_mask(df)
+    df = df.assign(**{
+        'Campuses Procuring': mask_labels(mask, campus_cols),
+        'Campus Contacts': mask_labels(mask, [f"{c} ({campus_contacts[c]})" for c in campus_cols]),
+        'Full Campus Names': mask_labels(mask, [campus_name_map[c] for c in campus_cols]),
+    })
+    return df, mask
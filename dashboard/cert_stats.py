@@ -0,0 +1,104 @@
+"""Product counts per certification for the stats views and the Explorer chart.
+
+Counts are of distinct products (``product_id``, see dashboard.dedup): a
+product counts for a certification when any of its listings in scope
+carries it, so near-duplicate listings count once and no flag moves from
+one listing, campus or distributor to another. Distinct counts don't add
+up across groups of rows, so there is no cube to slice:
+
+- the whole-dataset tables (totals, campus x certification, per
+  distributor) are computed once per dataset version;
+- a selection's counts scan its rows, one pass over exactly the rows the
+  Explorer table shows (the result is cached with the selection).
+
+Every count is an OR of certification masks per product (or per product
+and distributor) followed by a weighted sum over the distinct masks, so it
+costs one pass over the rows plus a small matrix product.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.campuses import campus_cols, campus_name_map
+from dashboard.certifications import sustainability_dict
+from dashboard.perf import timed
+from dashboard.schema import bit_matrix, flag, or_by_group
+
+
+def _or_by(keys, masks):
+    """Distinct ``keys`` and the OR of ``masks`` over the rows of each."""
+    codes, uniques = pd.factorize(keys)
+    return uniques, or_by_group(codes, masks, len(uniques))
+
+
+def _bit_totals(masks, width):
+    """How many of ``masks`` have each of the low ``width`` bits set."""
+    distinct, counts = np.unique(masks, return_counts=True)
+    return counts @ bit_matrix(distinct, width)
+
+
+class CertificationStats:
+    def __init__(self, df, campus_mask, cert_cols):
+        self.cert_cols = list(cert_cols)
+        width = len(self.cert_cols)
+
+        self.cert_mask = np.zeros(len(df), dtype=np.uint64)
+        for bit, col in enumerate(self.cert_cols):
+            self.cert_mask |= flag(df, col).astype(np.uint64) << np.uint64(bit)
+        if 'product_id' in df.columns:
+            self.product = df['product_id'].to_numpy(dtype=np.int64)
+        else:
+            self.product = np.arange(len(df), dtype=np.int64)
+
+        _, masks = _or_by(self.product, self.cert_mask)
+        self.n_products = len(masks)  # distinct products in the dataset
+        self.totals = _bit_totals(masks, width)
+
+        campus_mask = campus_mask.astype(np.uint64)
+        self.campus_table = np.zeros((len(campus_cols), width), dtype=np.int64)
+        for bit in range(len(campus_cols)):
+            self.campus_table[bit] = self._count(np.flatnonzero(campus_mask >> np.uint64(bit) & np.uint64(1)))
+
+        # One entry per (product, distributor) pair, carrying the OR of the pair's certifications
+        distributor_codes, self.distributors = df['Distributor'].factorize(sort=True)
+        known = distributor_codes >= 0
+        pairs, masks = _or_by(self.product[known] * len(self.distributors) + distributor_codes[known], self.cert_mask[known])
+        distributor = pairs % max(len(self.distributors), 1)
+        groups = pd.DataFrame({"distributor": distributor, "cert": masks}).value_counts(sort=False)
+        self.distributor_table = np.zeros((len(self.distributors), width), dtype=np.int64)
+        np.add.at(
+            self.distributor_table,
+            groups.index.get_level_values("distributor").to_numpy(),
+            bit_matrix(groups.index.get_level_values("cert").to_numpy(dtype=np.uint64), width) * groups.to_numpy()[:, None],
+        )
+        self.distributor_totals = np.bincount(distributor, minlength=len(self.distributors))
+
+    def _count(self, positions):
+        """Products per certification among the rows at ``positions``."""
+        _, masks = _or_by(self.product[positions], self.cert_mask[positions])
+        return _bit_totals(masks, len(self.cert_cols))
+
+    @timed("cert_stats.cert_counts")
+    def cert_counts(self, names=sustainability_dict, positions=None):
+        """Non-zero product counts per certification, keyed by ``names[code]``.
+
+        Counts the rows at ``positions`` (a selection's row positions), or
+        every row, whatever its aggregator flags.
+        """
+        totals = self.totals if positions is None else self._count(positions)
+        return {names[c]: int(t) for c, t in zip(self.cert_cols, totals) if c in names and t > 0}
+
+    def campus_by_cert(self):
+        """Products per campus x certification, labelled with full names."""
+        return pd.DataFrame(
+            self.campus_table,
+            index=[campus_name_map[c] for c in campus_cols],
+            columns=[sustainability_dict[c] for c in self.cert_cols],
+        )
+
+    def distributor_breakdown(self):
+        """Products per distributor, in total and per certification."""
+        breakdown = pd.DataFrame(self.distributor_table, index=list(self.distributors),
+                                 columns=[sustainability_dict[c] for c in self.cert_cols])
+        breakdown.insert(0, "Products", self.distributor_totals.astype(np.int64))
+        breakdown.index.name = "Distributor"
+        return breakdown
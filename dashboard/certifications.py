@@ -0,0 +1,52 @@
+"""Sustainability certification codes used as flag columns in the sheet."""
+
+# Sustainability standard mapping
+sustainability_dict = {
+    "OG": "Organic",
+    "CH": "Certified Humane",
+    "FT": "Fair Trade",
+    "RAC": "Regenerative Ag.",
+    "AGA": "Grassfed Assoc.",
+    "AWA": "Animal Welfare",
+    "GAP": "Global Animal Partnership",
+    "AHC": "American Humane Certified",
+    "HFAC": "Humane Farm Care",
+    "MSC": "Marine Stewardship Council",
+    "BAP": "Best Aquaculture Practices",
+    "MBA": "Monterrey Bay Aquarium",
+    "WWF": "WWF/Good Fish Foundation",
+    "OWR": "Ocean Wise Recommended",
+    "SSB": "Sailors for the Sea Blue list",
+    "SFSC": "Short Food supply chain",
+    "SP": "Small producer",
+    "BFC": "Bird Friendly Coffee",
+    "BBC": "Bee Better Certified (Xerces Society)",
+    "FAC": "Food Alliance Certified",
+    "SPP": "Small Producers Symbol",
+    "EFI": "Equitable Food Initiative",
+    "MWD": "Milk with Dignity",
+    "NAE": "No Antibiotics Ever"
+}
+
+# The certifications charted on the Sustainability Stats page (and its static export)
+stats_certifications = {
+    "OG": "Organic",
+    "CH": "Certified Humane",
+    "FT": "Fair Trade",
+    "RAC": "Regenerative Ag.",
+    "AGA": "Grassfed Assoc.",
+    "AWA": "Animal Welfare",
+    "GAP": "Global Animal Partnership",
+    "AHC": "American Humane Certified",
+    "HFAC": "Humane Farm Care",
+    "MSC": "Marine Stewardship Council",
+    "BAP": "Best Aquaculture Practices",
+    "MBA": "Monterrey Bay Aquarium"
+}
+
+# Aggregator choices offered in the sidebar and the flag columns behind them
+aggregator_columns = {
+    "Both": ["AASHE", "PGH"],
+    "AASHE STARS": ["AASHE"],
+    "Practice Greenhealth": ["PGH"],
+}
@@ -0,0 +1,67 @@
+"""Chart rendering shared by the pages.
+
+Two backends are available, picked with ``DASHBOARD_CHART_BACKEND``:
+
+- ``matplotlib`` (default): the figure is rendered once per distinct set of
+  counts to PNG bytes and cached; the figure is never registered with
+  pyplot, so nothing accumulates across reruns.
+- ``vega-lite``: Streamlit's native charts. Matplotlib is never imported.
+"""
+import io
+import os
+
+import pandas as pd
+import streamlit as st
+
+from dashboard.perf import count, span
+
+CHART_BACKEND = os.getenv("DASHBOARD_CHART_BACKEND", "matplotlib")
+
+
+def render_barh_png(labels, values, figsize, xlabel, ylabel):
+    """PNG bytes of a horizontal bar chart; uncached, also used by the static export."""
+    # Imported here so the vega-lite backend never pays for matplotlib
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    try:
+        ax = fig.subplots()
+        ax.barh(list(labels), list(values))
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def barh_png(labels, values, figsize, xlabel, ylabel):
+    count("charts.png_renders")  # only runs on a cache miss
+    return render_barh_png(labels, values, figsize, xlabel, ylabel)
+
+
+def barh_chart(counts, figsize=(4, 3), xlabel="Number of Products", ylabel="Certification"):
+    """Horizontal bar chart of a ``{label: count}`` dict, in dict order."""
+    labels = tuple(counts)
+    values = tuple(int(v) for v in counts.values())
+
+    with span("charts.barh", backend=CHART_BACKEND):
+        _draw_barh(labels, values, figsize, xlabel, ylabel)
+
+
+def _draw_barh(labels, values, figsize, xlabel, ylabel):
+    if CHART_BACKEND == "vega-lite":
+        data = pd.DataFrame({ylabel: labels, xlabel: values})
+        st.vega_lite_chart(data, {
+            "mark": "bar",
+            "encoding": {
+                "y": {"field": ylabel, "type": "nominal", "sort": list(labels)},
+                "x": {"field": xlabel, "type": "quantitative"},
+                "tooltip": [{"field": ylabel}, {"field": xlabel, "type": "quantitative"}],
+            },
+        })
+    else:
+        count("charts.png_requests")
+        st.image(barh_png(labels, values, figsize, xlabel, ylabel))
@@ -0,0 +1,101 @@
+"""Data access for the dashboard pages.
+
+The Google Sheet (or the per-campus sources, see dashboard.ingest) is the
+source of truth, but pages never read it directly: the merged data is kept
+as a local Parquet snapshot, which the background refresher
+(dashboard.refresh) revalidates every SNAPSHOT_TTL seconds. Until the
+sources have been reached we serve the last snapshot, or the bundled CSV if
+there is none.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from dashboard.dedup import add_product_ids
+from dashboard.perf import timed
+from dashboard.schema import SCHEMA_VERSION, read_csv
+
+SHEET_URL = os.getenv(
+    "DASHBOARD_SHEET_URL",
+    "https://docs.google.com/spreadsheets/d/1qsapyNmZleoL75aIwH57W3nqTc_VLhdbFEieOTwYWiI/export?format=csv",
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+BUNDLED_CSV = ROOT / "Data_for_dashboard.csv"
+CACHE_DIR = Path(os.getenv("DASHBOARD_CACHE_DIR", ROOT / ".cache"))
+SNAPSHOT_PATH = CACHE_DIR / "snapshot.parquet"
+META_PATH = CACHE_DIR / "snapshot.json"
+
+SNAPSHOT_TTL = int(os.getenv("DASHBOARD_SNAPSHOT_TTL", "600"))  # seconds
+FETCH_TIMEOUT = 10  # seconds
+
+
+def _read_meta():
+    try:
+        return json.loads(META_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_snapshot(df, meta):
+    # Write to temp files and rename so readers never see a half-written snapshot
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_snapshot = SNAPSHOT_PATH.with_suffix(".parquet.tmp")
+    tmp_meta = META_PATH.with_suffix(".json.tmp")
+    df.to_parquet(tmp_snapshot, index=False)
+    tmp_meta.write_text(json.dumps(meta))
+    os.replace(tmp_snapshot, SNAPSHOT_PATH)
+    os.replace(tmp_meta, META_PATH)
+
+
+def _touch_meta(meta):
+    meta = dict(meta, fetched_at=time.time())
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_meta = META_PATH.with_suffix(".json.tmp")
+    tmp_meta.write_text(json.dumps(meta))
+    os.replace(tmp_meta, META_PATH)
+    return meta
+
+
+def _has_snapshot(meta):
+    return SNAPSHOT_PATH.exists() and meta.get("schema") == SCHEMA_VERSION
+
+
+def load_bundled():
+    df = add_product_ids(read_csv(BUNDLED_CSV))
+    version = hashlib.sha256(BUNDLED_CSV.read_bytes()).hexdigest()[:12]
+    return df, {"version": version, "source": str(BUNDLED_CSV)}
+
+
+@timed("data.load_local")
+def load_local():
+    """Return ``(df, meta)`` from the local snapshot, or the bundled CSV if there is none.
+
+    Never touches the network; fetching is left to the background refresher.
+    """
+    meta = _read_meta()
+    if _has_snapshot(meta):
+        try:
+            return pd.read_parquet(SNAPSHOT_PATH), meta
+        except (OSError, ValueError):
+            pass  # unreadable snapshot: fall back and let the refresher replace it
+    return load_bundled()
+
+
+def save_snapshot(df, meta):
+    try:
+        _write_snapshot(df, meta)
+    except OSError:
+        pass  # read-only deploys still serve the fresh frame for this process
+
+
+def mark_fresh(meta):
+    """Record that the snapshot described by ``meta`` was just revalidated."""
+    try:
+        return _touch_meta(meta)
+    except OSError:
+        return dict(meta, fetched_at=time.time())
@@ -0,0 +1,91 @@
+"""The prepared dataset shared by every session in the process.
+
+``get_dataset()`` returns the current dataset: the snapshot with its derived
+columns and indexes, computed once per data version; all sessions read the
+same frame. Pages must treat ``dataset.df`` as read-only: slicing it is
+free, and with copy-on-write any accidental mutation copies the slice
+instead of touching the shared frame.
+"""
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard.campuses import add_campus_columns
+from dashboard.certifications import sustainability_dict
+from dashboard.cert_stats import CertificationStats
+from dashboard.data import BUNDLED_CSV, load_bundled, load_local
+from dashboard.entity_index import EntityIndex
+from dashboard.filter_index import FilterIndex
+from dashboard.perf import span
+from dashboard.refresh import Refresher, validate
+from dashboard.schema import flag
+from dashboard.search import TrigramIndex
+
+log = logging.getLogger(__name__)
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # Copy-on-write is always on from pandas 3
+    pd.set_option("mode.copy_on_write", True)
+
+
+@dataclass(frozen=True)
+class PreparedDataset:
+    df: pd.DataFrame
+    campus_mask: np.ndarray  # bit i set when campus_cols[i] procures the row
+    cert_cols: list
+    filter_index: FilterIndex
+    cert_stats: CertificationStats
+    entity_index: EntityIndex
+    search_index: TrigramIndex
+    version: str
+    source: str
+
+
+def prepare(df, meta):
+    with span("prepare.campus_columns"):
+        df, mask = add_campus_columns(df)
+    # Certifications that occur in the data (the flags themselves are packed into cert_bits)
+    cert_cols = [col for col in sustainability_dict if flag(df, col).any()]
+    with span("prepare.filter_index"):
+        filter_index = FilterIndex(df, mask, cert_cols)
+    with span("prepare.cert_stats"):
+        cert_stats = CertificationStats(df, mask, cert_cols)
+    with span("prepare.entity_index"):
+        entity_index = EntityIndex(df, mask)
+    with span("prepare.search_index"):
+        search_index = TrigramIndex(df)
+    return PreparedDataset(
+        df=df,
+        campus_mask=mask,
+        cert_cols=cert_cols,
+        filter_index=filter_index,
+        cert_stats=cert_stats,
+        entity_index=entity_index,
+        search_index=search_index,
+        version=meta.get("version", ""),
+        source=meta.get("source", ""),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_refresher():
+    df, meta = load_local()
+    try:
+        validate(df)
+        refresher = Refresher(prepare, df, meta)
+    except Exception as e:
+        if meta.get("source") == str(BUNDLED_CSV):
+            raise
+        # A snapshot that can't be prepared must not keep the app down: serve the bundled data
+        log.warning("Could not prepare the local snapshot, serving the bundled CSV: %s", e)
+        df, meta = load_bundled()
+        refresher = Refresher(prepare, df, meta)
+    return refresher.start()
+
+
+def get_dataset():
+    """The current prepared dataset; swapped atomically by the background refresher."""
+    return get_refresher().current
@@ -0,0 +1,230 @@
+"""Entity resolution for product listings submitted by different campuses.
+
+The same item often arrives under slightly different names, e.g. "Ben &
+Jerrys (B&J) Ice Cream Cherry Garcia Pint (pt)" and "Ben & Jerry's Cherry
+Garcia Ice Cream Pint". At ingest every row gets a ``product_id`` shared by
+all listings of the same product:
+
+1. Names are reduced to a set of tokens: case, punctuation, possessives,
+   plurals, unit spellings and stop words are folded away and word order
+   is ignored. A parenthetical is dropped only when it restates the rest of
+   the name ("Ben & Jerrys (B&J)", "Pint (pt)"); one that adds something,
+   like "(ORGANIC)" or a size, stays part of the name. Listings from the
+   same supplier with the same token set are one product.
+2. Listings of the same supplier and category whose token sets differ in
+   a single misspelled word are merged too. The word must be at least
+   MIN_TYPO_LENGTH long and the edit can't touch its first letter, so
+   "milk" / "silk" or "Jazzleberry" / "Razzleberry" stay apart. Candidates
+   come from a blocking index keyed on the supplier, the category and the
+   token set with one token left out, so only listings that agree on
+   everything else are ever compared; there is no pairwise pass.
+3. Matches are merged with union-find and each group gets a dense id.
+
+Words containing digits (sizes, pack counts) must match exactly, so a 12oz
+and a 16oz listing stay separate products.
+"""
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from dashboard.search import normalize
+
+STOP_WORDS = {"a", "and", "the", "of", "with", "w", "in"}
+SYNONYMS = {
+    "pt": "pint", "oz": "ounce", "lb": "pound", "lbs": "pound", "gal": "gallon", "qt": "quart",
+    "ct": "count", "ea": "each", "pk": "pack", "org": "organic",
+}
+SUPPLIER_SUFFIXES = {"inc", "llc", "co", "corp", "company", "ltd"}
+MAX_TOKENS = 12  # longer names are only merged on an exact token match
+MAX_BLOCK = 64  # blocks with more distinct left-out words than this are not compared
+MIN_TYPO_LENGTH = 5  # shorter words must match exactly
+# Qualifier abbreviations only restate a name that spells the qualifier out
+QUALIFIERS = {"og": ("organic",), "org": ("organic",), "ft": ("fair", "trade"), "gf": ("gluten", "free")}
+
+_PARENTHETICAL = re.compile(r"\(([^()0-9]*)\)")  # sizes like "(5lb)" are always kept
+_APOSTROPHE = re.compile(r"['’]")
+_DIGIT_BOUNDARY = re.compile(r"(?<=\d)(?=[a-z])|(?<=[a-z])(?=\d)")
+
+
+@lru_cache(maxsize=1 << 16)
+def _word(word):
+    word = SYNONYMS.get(word, word)
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def _words(text):
+    text = _DIGIT_BOUNDARY.sub(" ", normalize(_APOSTROPHE.sub("", text)))  # "12oz" -> "12 oz"
+    return [w for w in text.split() if w not in STOP_WORDS]
+
+
+def _abbreviates(abbreviation, words):
+    """True when ``abbreviation`` is the initials of consecutive ``words``, or a contraction of one of them."""
+    initials = "".join(w[0] for w in words)
+    if len(abbreviation) > 1 and abbreviation in initials:
+        return True
+    # "pt" for "pint", "vgn" for "vegan": same first letter, the rest in order
+    return any(
+        len(abbreviation) < len(w) and w[0] == abbreviation[0] and _is_subsequence(abbreviation[1:], w[1:])
+        for w in words
+    )
+
+
+def _is_subsequence(part, word):
+    letters = iter(word)
+    return all(c in letters for c in part)
+
+
+def _restates(inner, words):
+    """True when a parenthetical's words add nothing to the ``words`` around it."""
+    inner_words = _words(inner)
+    if not inner_words:
+        return True
+    known = {_word(w) for w in words}
+    for w in inner_words:
+        if w in QUALIFIERS:
+            if not set(QUALIFIERS[w]) <= known:
+                return False
+        elif _word(w) not in known and not _abbreviates("".join(inner_words), words):
+            return False
+    return True
+
+
+def name_tokens(name):
+    """Sorted distinct normalized words of a product name."""
+    text = str(name).lower()
+    if "(" in text:
+        outside = _words(_PARENTHETICAL.sub(" ", text))
+        text = _PARENTHETICAL.sub(lambda m: " " if _restates(m.group(1), outside) else f" {m.group(1)} ", text)
+    return tuple(sorted({_word(w) for w in _words(text)}))
+
+
+def supplier_key(supplier):
+    return " ".join(w for w in normalize(supplier).split() if w not in SUPPLIER_SUFFIXES)
+
+
+def _one_typo(a, b):
+    """True when ``a`` and ``b`` are one substitution, insertion, deletion or transposition apart."""
+    if min(len(a), len(b)) < MIN_TYPO_LENGTH or abs(len(a) - len(b)) > 1:
+        return False
+    if any(c.isdigit() for c in a + b):
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if i == 0:
+        return False  # an edit to the first letter usually makes a different word
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2] and a[i + 2:] == b[i + 2:])
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+def _listings(df):
+    """Per known row, the index of its (supplier, token set) listing; the listings; which rows are known.
+
+    Each listing also carries the category codes of its rows.
+    """
+    supplier_codes, suppliers = df['Supplier'].factorize()
+    name_codes, names = df['ProductName'].factorize()
+    # Normalize each distinct string once, then map the results back to the rows
+    supplier_ids, _ = pd.Index([supplier_key(s) for s in suppliers], dtype=object).factorize()
+    tokens = [name_tokens(n) for n in names]
+    token_ids, token_uniques = pd.Index([" ".join(t) for t in tokens], dtype=object).factorize()
+    token_sets = [None] * len(token_uniques)
+    for name, token_id in enumerate(token_ids):
+        token_sets[token_id] = tokens[name]
+
+    known = (supplier_codes >= 0) & (name_codes >= 0)
+    n_token_sets = max(len(token_sets), 1)
+    row_keys = supplier_ids[supplier_codes[known]].astype(np.int64) * n_token_sets + token_ids[name_codes[known]]
+    listing, uniques = pd.factorize(row_keys)
+    # Distinct (listing, category) pairs; code 0 is a row without a category
+    category_codes = df['Category'].factorize()[0][known].astype(np.int64) + 1
+    width = int(category_codes.max(initial=0)) + 1
+    categories = [set() for _ in range(len(uniques))]
+    for key in np.unique(listing.astype(np.int64) * width + category_codes).tolist():
+        i, code = divmod(key, width)
+        if code:
+            categories[i].add(code)
+    listings = [(key // n_token_sets, token_sets[key % n_token_sets], cats)
+                for key, cats in zip(uniques.tolist(), categories)]
+    return listing, listings, known
+
+
+def product_ids(df):
+    """Dense product id per row; near-duplicate listings of one supplier share an id."""
+    if df.empty:
+        return np.empty(0, dtype=np.int32)
+    listing, listings, known = _listings(df)
+
+    # Blocking index: supplier + category + token set minus one word -> {left-out word: listing}
+    blocks = defaultdict(dict)
+    for i, (supplier, tokens, categories) in enumerate(listings):
+        if not 2 <= len(tokens) <= MAX_TOKENS:
+            continue
+        for category in categories:
+            for k, word in enumerate(tokens):
+                blocks[(supplier, category, tokens[:k] + tokens[k + 1:])][word] = i
+
+    groups = _UnionFind(len(listings))
+    for block in blocks.values():
+        if len(block) < 2 or len(block) > MAX_BLOCK:
+            continue
+        words = list(block)
+        for x in range(len(words)):
+            for y in range(x + 1, len(words)):
+                if _one_typo(words[x], words[y]):
+                    groups.union(block[words[x]], block[words[y]])
+
+    roots = np.array([groups.find(i) for i in range(len(listings))], dtype=np.int64)
+    ids = np.empty(len(df), dtype=np.int64)
+    ids[known] = roots[listing]
+    # Rows without a supplier or name can't be matched: each is its own product
+    ids[~known] = len(listings) + np.arange(int((~known).sum()))
+    return pd.factorize(ids)[0].astype(np.int32)
+
+
+def add_product_ids(df):
+    return df.assign(product_id=product_ids(df))
+
+
+def merged_listings(df):
+    """Products that were merged from several differently named listings, largest first."""
+    names = df.groupby('product_id', sort=False)['ProductName']
+    variants = names.nunique()
+    merged = variants[variants > 1].index
+    if merged.empty:
+        return pd.DataFrame(columns=["Product", "Supplier", "Listings", "Name variants"])
+    subset = df[df['product_id'].isin(merged)]
+    grouped = subset.groupby('product_id', sort=False)
+    table = pd.DataFrame({
+        "Product": grouped['ProductName'].agg(lambda s: s.mode().iloc[0]),
+        "Supplier": grouped['Supplier'].first(),
+        "Listings": grouped.size(),
+        "Name variants": grouped['ProductName'].agg(lambda s: " | ".join(sorted(s.dropna().unique()))),
+    })
+    return table.sort_values("Listings", ascending=False, ignore_index=True)
@@ -0,0 +1,91 @@
+"""Distributor <-> supplier lookup index for the Distributor & Supplier view.
+
+Built once per dataset version. For every distributor and every supplier
+it keeps the row positions, the sorted list of counterparts on the other
+side, the OR of the campus masks and the product count per category, so
+switching the selectbox is a dictionary lookup.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard.campuses import campus_cols, campus_name_map
+from dashboard.schema import or_by_group
+
+
+@dataclass(frozen=True)
+class EntityEntry:
+    name: str
+    positions: np.ndarray
+    counterparts: list  # sorted names on the other side of the bipartite graph
+    campus_mask: int
+    category_counts: dict  # category -> number of products, largest first
+
+    @property
+    def campuses(self):
+        return [campus_name_map[c] for bit, c in enumerate(campus_cols) if self.campus_mask >> bit & 1]
+
+
+def _grouped_pairs(codes, other_codes, n_other):
+    """Distinct (code, other) pairs with their row counts, sorted by code then other."""
+    keep = (codes >= 0) & (other_codes >= 0)
+    keys, counts = np.unique(codes[keep].astype(np.int64) * n_other + other_codes[keep], return_counts=True)
+    return keys // n_other, keys % n_other, counts
+
+
+def _build(df, column, counterpart, campus_mask):
+    codes, names = df[column].factorize(sort=True)
+    known = codes >= 0
+    order = np.flatnonzero(known)[np.argsort(codes[known], kind="stable")]
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[known], minlength=len(names)), out=offsets[1:])
+    masks = or_by_group(codes, campus_mask, len(names))
+
+    # Sorted codes on the other side give sorted counterpart names for free
+    other_codes, other_names = df[counterpart].factorize(sort=True)
+    pair_entity, pair_other, _ = _grouped_pairs(codes, other_codes, max(len(other_names), 1))
+    pair_bounds = np.searchsorted(pair_entity, np.arange(len(names) + 1))
+
+    category_codes, category_names = df['Category'].factorize(sort=True)
+    cat_entity, cat_code, cat_count = _grouped_pairs(codes, category_codes, max(len(category_names), 1))
+    cat_bounds = np.searchsorted(cat_entity, np.arange(len(names) + 1))
+
+    entries = {}
+    for i, name in enumerate(names):
+        lo, hi = cat_bounds[i], cat_bounds[i + 1]
+        by_size = np.argsort(-cat_count[lo:hi], kind="stable")
+        entries[name] = EntityEntry(
+            name=name,
+            positions=order[offsets[i]:offsets[i + 1]],
+            counterparts=[other_names[j] for j in pair_other[pair_bounds[i]:pair_bounds[i + 1]]],
+            campus_mask=int(masks[i]),
+            category_counts={category_names[cat_code[lo + j]]: int(cat_count[lo + j]) for j in by_size},
+        )
+    return entries
+
+
+class EntityIndex:
+    def __init__(self, df, campus_mask):
+        self.distributors = _build(df, 'Distributor', 'Supplier', campus_mask)
+        self.suppliers = _build(df, 'Supplier', 'Distributor', campus_mask)
+
+    def multi_distributor_suppliers(self, min_distributors=2):
+        """Suppliers reachable through at least ``min_distributors`` distributors."""
+        rows = [
+            {
+                "Supplier": entry.name,
+                "Distributors": len(entry.counterparts),
+                "Distributor Names": ", ".join(entry.counterparts),
+                "Products": len(entry.positions),
+                "Campuses Procuring": ", ".join(entry.campuses),
+            }
+            for entry in self.suppliers.values()
+            if len(entry.counterparts) >= min_distributors
+        ]
+        table = pd.DataFrame(rows, columns=["Supplier", "Distributors", "Distributor Names", "Products", "Campuses Procuring"])
+        return table.sort_values(["Distributors", "Products"], ascending=False, kind="stable").reset_index(drop=True)
+
+    @property
+    def max_distributors(self):
+        return max((len(e.counterparts) for e in self.suppliers.values()), default=0)
@@ -0,0 +1,85 @@
+"""Download exports, generated only when a download button is clicked.
+
+Exports are cached by query key and format, and CSV-based formats are
+written in row chunks straight into the (optionally gzip-compressed)
+output buffer, so large selections never materialize as one big string.
+
+This bounds the intermediate text, not the result: ``st.download_button``
+sends its data as a single bytes object, so each export is still held in
+memory once in full (peak is about the payload plus one chunk, and the
+cached copy stays until it is evicted). Truly streamed downloads would need
+a file server outside Streamlit, e.g. the static export.
+"""
+import gzip
+import io
+
+import streamlit as st
+
+from dashboard.perf import span
+from dashboard.query_cache import QueryCache
+from dashboard.schema import unpack_flags
+
+CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_575  # a worksheet holds 1,048,576 rows, one of them the header
+
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Excel (XLSX)": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def _write_csv(frame, binary_stream):
+    text = io.TextIOWrapper(binary_stream, encoding="utf-8", newline="")
+    if frame.empty:
+        frame.to_csv(text, index=False)
+    for start in range(0, len(frame), CHUNK_ROWS):
+        frame.iloc[start:start + CHUNK_ROWS].to_csv(text, index=False, header=start == 0)
+    text.flush()
+    text.detach()
+
+
+def to_bytes(frame, fmt):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    with span("export.to_bytes", format=fmt, rows=len(frame)):
+        # Downloads keep the sheet's one-column-per-flag layout
+        frame = unpack_flags(frame)
+        buffer = io.BytesIO()
+        if fmt == "CSV":
+            _write_csv(frame, buffer)
+        elif fmt == "CSV (gzip)":
+            with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+                _write_csv(frame, gz)
+        elif fmt == "Parquet":
+            frame.to_parquet(buffer, index=False)
+        else:
+            if len(frame) > EXCEL_MAX_ROWS:
+                raise ValueError(f"{len(frame):,} rows don't fit in an Excel sheet (at most {EXCEL_MAX_ROWS:,})")
+            frame.to_excel(buffer, index=False)
+        return buffer.getvalue()
+
+
+@st.cache_resource
+def get_export_cache():
+    # Exports are far bigger than query results, so keep fewer of them
+    return QueryCache(maxsize=32, max_bytes=256 * 2**20)
+
+
+def download_button(label, dataset, selection, file_stem, key):
+    """Format picker plus a download button whose file is only built on click."""
+    formats, note = list(EXPORT_FORMATS), None
+    if len(selection) > EXCEL_MAX_ROWS:
+        # to_excel would fail inside the download callable, so don't offer it
+        formats.remove("Excel (XLSX)")
+        note = f"Excel isn't offered for more than {EXCEL_MAX_ROWS:,} rows."
+    fmt = st.selectbox("Download format", formats, key=f"{key}_format", help=note)
+    suffix, mime = EXPORT_FORMATS[fmt]
+    cache = get_export_cache()
+
+    def build():
+        return cache.get_or_compute(dataset.version, (fmt,) + selection.key,
+                                    lambda: to_bytes(selection.rows(dataset.df), fmt))
+
+    st.download_button(label, data=build, file_name=file_stem + suffix, mime=mime, key=key)
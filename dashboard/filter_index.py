@@ -0,0 +1,132 @@
+"""Packed bitmap index over the Category Explorer filters.
+
+Every filter value (category, region, campus, aggregator, certification)
+gets one bit per row, packed eight rows to a byte. A query (``Filters``) is answered
+by OR-ing or AND-ing the bitmaps of the selected values in each group,
+AND-ing the groups together and clearing the OR of the excluded values:
+one reduction per group over the packed bitmaps and a single unpack into
+row positions, so a query with many values costs about the same as one
+with a single value.
+"""
+from dataclasses import astuple, dataclass, fields
+
+import numpy as np
+
+from dashboard.campuses import campus_cols, region_map
+from dashboard.certifications import aggregator_columns
+from dashboard.schema import flag
+
+
+@dataclass(frozen=True)
+class Filters:
+    """A Category Explorer query: the groups below are AND-ed together.
+
+    An empty group doesn't filter. Categories and regions match any of the
+    selected values (a row is in a region when any of its campuses is);
+    campuses and certifications match any or all of them, per ``*_match``.
+    Rows with any excluded value are dropped.
+    """
+    aggregator: str = "Both"
+    categories: tuple = ()
+    regions: tuple = ()
+    campuses: tuple = ()
+    campus_match: str = "any"  # "any" or "all"
+    certs: tuple = ()
+    cert_match: str = "any"
+    exclude_categories: tuple = ()
+    exclude_campuses: tuple = ()
+    exclude_certs: tuple = ()
+
+    def __post_init__(self):
+        # Order doesn't matter, so equal queries get equal cache keys
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if not isinstance(value, str):
+                object.__setattr__(self, field.name, tuple(sorted(set(value))))
+
+    @property
+    def key(self):
+        return astuple(self)
+
+    def describe(self, cert_names=None):
+        """The query as a readable boolean expression."""
+        cert_names = cert_names or {}
+
+        def group(values, match="any"):
+            joined = f" {'AND' if match == 'all' else 'OR'} ".join(values)
+            return f"({joined})" if len(values) > 1 else joined
+
+        terms = []
+        if self.aggregator != "Both":
+            terms.append(self.aggregator)
+        if self.categories:
+            terms.append(group(self.categories))
+        if self.regions:
+            terms.append(group(self.regions))
+        if self.campuses:
+            terms.append(group(self.campuses, self.campus_match))
+        if self.certs:
+            terms.append(group([cert_names.get(c, c) for c in self.certs], self.cert_match))
+        excluded = list(self.exclude_categories) + list(self.exclude_campuses) + [cert_names.get(c, c) for c in self.exclude_certs]
+        if excluded:
+            terms.append(f"NOT {group(excluded)}")
+        return " AND ".join(terms) or "All products"
+
+
+class FilterIndex:
+    def __init__(self, df, campus_mask, cert_cols):
+        self.n_rows = len(df)
+        pack = np.packbits
+
+        self.all = pack(np.ones(self.n_rows, dtype=bool))
+        self.none = pack(np.zeros(self.n_rows, dtype=bool))
+
+        codes, uniques = df['Category'].factorize(sort=True)
+        self.categories = {value: pack(codes == i) for i, value in enumerate(uniques)}
+
+        self.campuses = {c: pack(campus_mask >> bit & 1 == 1) for bit, c in enumerate(campus_cols)}
+
+        self.regions = {}
+        for region, campuses in region_map.items():
+            bits = 0
+            for c in campuses:
+                bits |= 1 << campus_cols.index(c)
+            self.regions[region] = pack(campus_mask & bits != 0)
+
+        self.aggregators = {}
+        for option, cols in aggregator_columns.items():
+            hit = np.zeros(self.n_rows, dtype=bool)
+            for col in cols:
+                hit |= flag(df, col)
+            self.aggregators[option] = pack(hit)
+
+        self.certs = {c: pack(flag(df, c)) for c in cert_cols}
+
+    def _bitmaps(self, lookup, values):
+        # Unknown values match nothing
+        return np.stack([lookup.get(value, self.none) for value in values])
+
+    def bitmap(self, filters):
+        include = [self.aggregators[filters.aggregator][None, :]]
+        for lookup, values, match in ((self.categories, filters.categories, "any"),
+                                      (self.regions, filters.regions, "any"),
+                                      (self.campuses, filters.campuses, filters.campus_match),
+                                      (self.certs, filters.certs, filters.cert_match)):
+            if values:
+                reduce = np.bitwise_and.reduce if match == "all" else np.bitwise_or.reduce
+                include.append(reduce(self._bitmaps(lookup, values), axis=0)[None, :])
+        bits = np.bitwise_and.reduce(np.concatenate(include), axis=0)
+
+        excluded = [(self.categories, filters.exclude_categories), (self.campuses, filters.exclude_campuses),
+                    (self.certs, filters.exclude_certs)]
+        excluded = [self._bitmaps(lookup, values) for lookup, values in excluded if values]
+        if excluded:
+            bits &= ~np.bitwise_or.reduce(np.concatenate(excluded), axis=0)
+        return bits
+
+    def positions(self, bits):
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+    def select(self, filters):
+        """Row positions matching a ``Filters`` query."""
+        return self.positions(self.bitmap(filters))
@@ -0,0 +1,215 @@
+"""Concurrent ingest of the per-campus data sources.
+
+Sources are listed in ``sources.yaml`` (see ``sources.example.yaml``); with
+no such file the single merged Google Sheet is the only source. On each
+refresh all sources are fetched in parallel with conditional requests.
+A source whose bytes didn't change is not parsed again, and when no
+source's parsed rows changed nothing is merged. Each source's parsed frame
+is cached on disk, so only the changed sources are re-parsed, even after a
+restart.
+
+The merge itself is not incremental: when any source changes, the cached
+frames of all sources are concatenated again and the whole result gets
+canonical product ids (dashboard.dedup), since duplicates usually come
+from different sources and an id can span several of them. Parsing is
+the per-source cost; concatenation and dedup stay proportional to the
+total row count.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import requests
+import yaml
+
+from dashboard.data import CACHE_DIR, FETCH_TIMEOUT, ROOT, SHEET_URL
+from dashboard.dedup import add_product_ids
+from dashboard.perf import span, timed
+from dashboard.schema import SCHEMA_VERSION, concat_frames, read_csv
+
+log = logging.getLogger(__name__)
+
+SOURCES_PATH = Path(os.getenv("DASHBOARD_SOURCES", ROOT / "sources.yaml"))
+SOURCE_CACHE_DIR = CACHE_DIR / "sources"
+MAX_WORKERS = 16
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    url: str
+
+
+def load_sources(path=SOURCES_PATH):
+    if not path.exists():
+        return [Source("sheet", SHEET_URL)]
+    config = yaml.safe_load(path.read_text()) or {}
+    sources = [Source(name=str(s["name"]), url=s["url"]) for s in config.get("sources", [])]
+    if not sources:
+        raise ValueError(f"No sources configured in {path}")
+    return sources
+
+
+def _row_hash(df):
+    """Order-sensitive hash of the parsed rows, independent of CSV formatting."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()[:12]
+
+
+class _SourceState:
+    """What we last saw of one source, mirrored to the source cache directory."""
+
+    def __init__(self, source):
+        self.source = source
+        self.frame_path = SOURCE_CACHE_DIR / f"{source.name}.parquet"
+        self.meta_path = SOURCE_CACHE_DIR / f"{source.name}.json"
+        self.meta = {}
+        self._frame = None
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            if meta.get("schema") == SCHEMA_VERSION and meta.get("url") == source.url and self.frame_path.exists():
+                self.meta = meta
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def known(self):
+        return bool(self.meta)
+
+    @property
+    def frame(self):
+        if self._frame is None and self.known:
+            self._frame = pd.read_parquet(self.frame_path)
+        return self._frame
+
+    def _write_meta(self):
+        tmp = self.meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.meta))
+        os.replace(tmp, self.meta_path)
+
+    def store(self, frame, meta):
+        self._frame, self.meta = frame, meta
+        try:
+            SOURCE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = self.frame_path.with_suffix(".parquet.tmp")
+            frame.to_parquet(tmp, index=False)
+            os.replace(tmp, self.frame_path)
+            self._write_meta()
+        except OSError:
+            pass  # keep the frame in memory for this process
+
+    def revalidated(self, meta):
+        """Same bytes as before; only the HTTP validators may have changed."""
+        self.meta.update(meta)
+        try:
+            self._write_meta()
+        except OSError:
+            pass
+
+
+class IngestPipeline:
+    def __init__(self, sources):
+        self.sources = sources
+        self.states = [_SourceState(s) for s in sources]
+        self.last_stats = {}
+
+    def _get(self, state):
+        headers = {}
+        if state.known:
+            if state.meta.get("etag"):
+                headers["If-None-Match"] = state.meta["etag"]
+            if state.meta.get("last_modified"):
+                headers["If-Modified-Since"] = state.meta["last_modified"]
+        resp = requests.get(state.source.url, headers=headers, timeout=FETCH_TIMEOUT)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        return resp
+
+    def _refresh_source(self, state):
+        """Bring one source up to date; returns "unchanged", "reparsed" or "changed"."""
+        resp = self._get(state)
+        if resp is None:
+            return "unchanged"
+        content_hash = hashlib.sha256(resp.content).hexdigest()[:12]
+        meta = {
+            "url": state.source.url,
+            "schema": SCHEMA_VERSION,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+        }
+        if state.known and content_hash == state.meta.get("content_hash"):
+            state.revalidated(meta)
+            return "unchanged"
+
+        frame = read_csv(io.BytesIO(resp.content))
+        meta["row_hash"] = _row_hash(frame)
+        status = "reparsed" if state.known and meta["row_hash"] == state.meta.get("row_hash") else "changed"
+        state.store(frame, meta)
+        return status
+
+    @timed("ingest.update")
+    def update(self, meta):
+        """Fetch every source concurrently and merge: ``(df, new_meta)``, or None when nothing changed.
+
+        Raises if a source fails and we have never seen it, since the merge would be incomplete.
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(self.states))) as pool:
+            futures = [pool.submit(self._refresh_source, state) for state in self.states]
+
+        statuses = {}
+        for state, future in zip(self.states, futures):
+            try:
+                statuses[state.source.name] = future.result()
+            except Exception as e:
+                if not state.known:
+                    raise RuntimeError(f"source {state.source.name!r} is unavailable: {e}") from e
+                log.warning("Source %s failed, keeping its last data: %s", state.source.name, e)
+                statuses[state.source.name] = "failed"
+        self.last_stats = {"statuses": statuses, "seconds": time.perf_counter() - started}
+
+        version = hashlib.sha256(
+            "".join(f"{s.source.name}:{s.meta['row_hash']};" for s in self.states).encode()
+        ).hexdigest()[:12]
+        if version == meta.get("version") and meta.get("schema") == SCHEMA_VERSION:
+            return None
+
+        # A copy, so nothing downstream can touch the cached frame the next change check relies on
+        df = self.states[0].frame.copy() if len(self.states) == 1 else concat_frames([s.frame for s in self.states])
+        with span("ingest.dedup", rows=len(df)):
+            # After the merge, so listings from different campuses' sources can match
+            df = add_product_ids(df)
+        new_meta = {
+            "version": version,
+            "source": self.sources[0].url if len(self.sources) == 1 else f"{len(self.sources)} sources",
+            "sources": {s.source.name: s.meta["row_hash"] for s in self.states},
+            "schema": SCHEMA_VERSION,
+            "fetched_at": time.time(),
+        }
+        return df, new_meta
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = IngestPipeline(load_sources())
+        return _pipeline
+
+
+def fetch_update(meta):
+    """Merged data if any source changed since ``meta``: ``(df, new_meta)``, or None."""
+    return get_pipeline().update(meta)
@@ -0,0 +1,115 @@
+"""Campus x campus overlap of products and suppliers for the Campus Overlap page.
+
+The campus flags form a 0/1 product x campus matrix P, so P.T @ P counts the
+products every pair of campuses shares (its diagonal is each campus's own
+count). Rows with the same campus mask contribute identically, so the
+product is taken over the distinct masks weighted by how often they occur:
+the work depends on the number of distinct purchasing patterns, not on the
+number of products. Suppliers get the same treatment with a supplier x
+campus matrix (a supplier counts for a campus when any of its products is
+bought there; for the whole dataset that is the mask the entity index
+already keeps). Near-duplicate listings (same ``product_id``, see
+dashboard.dedup) count as one product bought by the union of their
+campuses. Results are cached per dataset version and category.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.campuses import campus_cols, campus_name_map
+from dashboard.query_cache import get_query_cache
+from dashboard.schema import bit_matrix, or_by_group
+
+MEASURES = {
+    "Shared products": "products",
+    "Product similarity (Jaccard)": "product_jaccard",
+    "Shared suppliers": "suppliers",
+    "Supplier similarity (Jaccard)": "supplier_jaccard",
+}
+
+
+def _co_occurrence(masks, n_bits):
+    """``M.T @ M`` for the 0/1 matrix M with one row per mask, via the distinct masks."""
+    distinct, weights = np.unique(masks, return_counts=True)
+    bits = bit_matrix(distinct, n_bits)
+    return (bits.T * weights) @ bits
+
+
+def _jaccard(co_occurrence):
+    sizes = np.diag(co_occurrence)
+    union = sizes[:, None] + sizes[None, :] - co_occurrence
+    return np.divide(co_occurrence, union, out=np.zeros(co_occurrence.shape), where=union > 0)
+
+
+def _supplier_masks(suppliers, masks):
+    """OR of the campus masks of each supplier's rows: ``(names, masks)``."""
+    codes, names = suppliers.factorize(sort=True)
+    return np.asarray(names, dtype=object), or_by_group(codes, masks, len(names))
+
+
+class CampusOverlap:
+    def __init__(self, df, campus_mask, positions=None, supplier_masks=None):
+        """``supplier_masks`` is ``(names, masks)`` of the suppliers in scope, when already known."""
+        masks = campus_mask if positions is None else campus_mask[positions]
+        if supplier_masks is None:
+            # Products never span suppliers, so merging listings first doesn't change these
+            supplier_masks = _supplier_masks(df['Supplier'] if positions is None else df['Supplier'].take(positions), masks)
+        if 'product_id' in df.columns:
+            # One row per product, bought by every campus any of its listings was
+            product = df['product_id'].to_numpy() if positions is None else df['product_id'].to_numpy()[positions]
+            codes, uniques = pd.factorize(product)
+            masks = or_by_group(codes, masks, len(uniques))
+        n = len(campus_cols)
+
+        self.products = _co_occurrence(masks, n)
+        self.supplier_names, self.supplier_masks = supplier_masks
+        self.suppliers = _co_occurrence(self.supplier_masks, n)
+        self.product_jaccard = _jaccard(self.products)
+        self.supplier_jaccard = _jaccard(self.suppliers)
+
+    @property
+    def active(self):
+        """Indexes of the campuses that bought anything in this selection."""
+        return np.flatnonzero(np.diag(self.products) > 0)
+
+    @property
+    def active_codes(self):
+        return [campus_cols[i] for i in self.active]
+
+    def matrix(self, measure):
+        """Campus x campus DataFrame of one of the ``MEASURES`` values, active campuses only."""
+        active = self.active
+        names = [campus_name_map[campus_cols[i]] for i in active]
+        return pd.DataFrame(getattr(self, measure)[np.ix_(active, active)], index=names, columns=names)
+
+    def pairs(self):
+        """Every pair of active campuses with its overlap figures, most similar first."""
+        active = self.active
+        first, second = np.triu_indices(len(active), k=1)
+        i, j = active[first], active[second]
+        table = pd.DataFrame({
+            "Campus A": [campus_name_map[campus_cols[k]] for k in i],
+            "Campus B": [campus_name_map[campus_cols[k]] for k in j],
+            "Shared products": self.products[i, j],
+            "Product similarity": self.product_jaccard[i, j],
+            "Shared suppliers": self.suppliers[i, j],
+            "Supplier similarity": self.supplier_jaccard[i, j],
+        })
+        return table.sort_values(["Product similarity", "Shared products"], ascending=False, ignore_index=True)
+
+    def shared_suppliers(self, a, b):
+        """Sorted names of the suppliers both campuses (``campus_cols`` codes) buy from."""
+        both = (1 << campus_cols.index(a)) | (1 << campus_cols.index(b))
+        return list(self.supplier_names[self.supplier_masks & both == both])
+
+
+def campus_overlap(dataset, category="All"):
+    def compute():
+        index = dataset.filter_index
+        if category == "All":
+            entries = dataset.entity_index.suppliers.values()
+            suppliers = (np.array([e.name for e in entries], dtype=object),
+                         np.array([e.campus_mask for e in entries], dtype=dataset.campus_mask.dtype))
+            return CampusOverlap(dataset.df, dataset.campus_mask, supplier_masks=suppliers)
+        return CampusOverlap(dataset.df, dataset.campus_mask, index.positions(index.categories[category]))
+
+    return get_query_cache().get_or_compute(dataset.version, ("campus_overlap", category), compute)
@@ -0,0 +1,159 @@
+"""Lightweight timing and counters for the dashboard's hot paths.
+
+``span(name)`` times a block and ``timed(name)`` a function; ``count(name)``
+bumps a counter. Durations go into a bounded window per span name, so
+percentiles reflect recent traffic, and into a bounded event log that the
+admin page exports as JSON lines. Everything is process-wide: all sessions
+and the background refresher report into the same tracer.
+
+Deliberately free of numpy/pandas so the light pages can use it too.
+"""
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+WINDOW = 1000  # recent samples kept per span
+EVENT_LOG_SIZE = 5000
+SESSION_TTL = 3600  # seconds before an idle session drops out of the table
+
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def _percentile(ordered, q):
+    # Nearest-rank percentile of an already sorted list
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _sizeof(value):
+    # pandas objects and numpy arrays report their buffers; anything else is a shallow estimate
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class Tracer:
+    def __init__(self, window=WINDOW, log_size=EVENT_LOG_SIZE):
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples = {}  # span name -> deque of recent durations (ms)
+        self._calls = Counter()
+        self._counters = Counter()
+        self._events = deque(maxlen=log_size)
+        self._sessions = {}
+        self.started = time.time()
+
+    def record(self, name, ms, **fields):
+        event = {"ts": time.time(), "span": name, "ms": round(ms, 3), **fields}
+        session = _session_id()
+        if session:
+            event["session"] = session
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self._window)
+            samples.append(ms)
+            self._calls[name] += 1
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name, **fields):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, **fields)
+
+    def timed(self, name):
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def track_session(self, page, state):
+        """Note that this session just ran ``page``, with an estimate of its session state size."""
+        session = _session_id()
+        if session is None:
+            return
+        state_bytes = 0
+        for key in list(state.keys()):
+            try:
+                state_bytes += _sizeof(state[key])
+            except (KeyError, TypeError, ValueError):
+                pass  # widget values can disappear mid-run
+        now = time.time()
+        with self._lock:
+            info = self._sessions.setdefault(session, {"reruns": 0, "first_seen": now})
+            info.update(page=page, last_seen=now, state_bytes=state_bytes)
+            info["reruns"] += 1
+            for stale in [s for s, i in self._sessions.items() if now - i["last_seen"] > SESSION_TTL]:
+                del self._sessions[stale]
+
+    def summary(self):
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            calls = dict(self._calls)
+            counters = dict(self._counters)
+            sessions = {s: dict(info) for s, info in self._sessions.items()}
+        spans = {
+            name: {
+                "calls": calls[name],
+                "p50_ms": _percentile(ordered, 0.50),
+                "p95_ms": _percentile(ordered, 0.95),
+                "max_ms": ordered[-1],
+                "mean_ms": sum(ordered) / len(ordered),
+            }
+            for name, ordered in sorted(samples.items())
+        }
+        return {"since": self.started, "spans": spans, "counters": counters, "sessions": sessions}
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._calls.clear()
+            self._counters.clear()
+            self._events.clear()
+            self.started = time.time()
+
+
+tracer = Tracer()
+
+span = tracer.span
+timed = tracer.timed
+count = tracer.count
+
+
+def track_session(page):
+    tracer.track_session(page, st.session_state)
+
+
+def process_memory():
+    """Peak resident memory of the process in bytes, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
@@ -0,0 +1,110 @@
+"""Cached page queries.
+
+Each query returns a ``Selection`` bundling the positions of the selected
+rows with the summaries the pages show for them. Results live in the shared
+query cache, so a popular filter combination is computed once per dataset
+version. Selections don't hold the rows themselves: the pages take them
+from ``dataset.df`` when needed (one table page, or an export on click), so
+a cached selection costs a few bytes per row rather than a copy of it.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from dashboard.campuses import campus_cols, campus_name_map
+from dashboard.dedup import merged_listings
+from dashboard.perf import timed
+from dashboard.query_cache import get_query_cache
+from dashboard.search import normalize
+
+
+@dataclass(frozen=True)
+class Selection:
+    key: tuple  # normalized query key, shared with the export cache
+    positions: np.ndarray  # into dataset.df
+    suppliers: list
+    distributors: list
+    campuses: list  # full campus names, in campus_cols order
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes
+
+    def rows(self, df):
+        """The selected rows of ``df`` (the dataset frame the positions index)."""
+        return df.take(self.positions)
+
+
+def _labels(column, positions):
+    """Sorted distinct values of a categorical ``column`` at ``positions``."""
+    codes = np.unique(column.cat.codes.to_numpy()[positions])
+    return sorted(column.cat.categories[codes[codes >= 0]])
+
+
+def _selection(dataset, key, positions):
+    df = dataset.df
+    procured = np.bitwise_or.reduce(dataset.campus_mask[positions]) if len(positions) else 0
+    return Selection(
+        key=key,
+        positions=positions,
+        suppliers=_labels(df['Supplier'], positions),
+        distributors=_labels(df['Distributor'], positions),
+        campuses=[campus_name_map[c] for bit, c in enumerate(campus_cols) if procured >> bit & 1],
+    )
+
+
+def _cached(dataset, key, compute):
+    return get_query_cache().get_or_compute(dataset.version, key, compute)
+
+
+@timed("explorer.filter")
+def explorer_selection(dataset, filters):
+    """Rows matching a ``Filters`` query, from the bitmap index."""
+    key = ("explorer",) + filters.key
+    return _cached(dataset, key, lambda: _selection(dataset, key, dataset.filter_index.select(filters)))
+
+
+@timed("entities.select")
+def entity_selection(dataset, column, value):
+    """Rows of one distributor or supplier (``column`` names which), from the entity index."""
+    key = (column, value)
+
+    def compute():
+        index = dataset.entity_index
+        entry = (index.distributors if column == 'Distributor' else index.suppliers).get(value)
+        if entry is None:
+            return _selection(dataset, key, np.empty(0, dtype=np.int64))
+        counterparts, own = entry.counterparts, [entry.name]
+        return Selection(
+            key=key,
+            positions=entry.positions,
+            suppliers=counterparts if column == 'Distributor' else own,
+            distributors=own if column == 'Distributor' else counterparts,
+            campuses=entry.campuses,
+        )
+
+    return _cached(dataset, key, compute)
+
+
+@timed("explorer.search")
+def search_selection(dataset, query, within):
+    """Rows of the ``within`` selection matching a product search, best match first."""
+    query = normalize(query)
+    key = ("search", query) + within.key
+    return _cached(dataset, key, lambda: _selection(
+        dataset, key, dataset.search_index.search(query, within=within.positions)))
+
+
+@timed("explorer.cert_counts")
+def selection_cert_counts(dataset, selection):
+    """Products per certification among exactly the rows of ``selection``."""
+    return _cached(dataset, ("cert_counts",) + selection.key,
+                   lambda: dataset.cert_stats.cert_counts(positions=selection.positions))
+
+
+def merged_products(dataset):
+    """Products that deduplication merged from differently named listings."""
+    return _cached(dataset, ("merged_listings",), lambda: merged_listings(dataset.df))
@@ -0,0 +1,94 @@
+"""Process-wide LRU cache for query results shared by every session.
+
+Entries are keyed by a normalized filter tuple and tagged with the dataset
+version; the first lookup against a new version drops everything cached
+for the old one. The cache is bounded both by entry count and by the bytes
+its values hold (``nbytes`` for arrays and selections, the length of
+bytes, ``memory_usage`` for frames), so a few huge results can't pile up.
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+MAX_ENTRIES = 256
+MAX_BYTES = 128 * 2**20
+
+
+def _nbytes(value):
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    return int(getattr(value, "nbytes", 0))
+
+
+class QueryCache:
+    def __init__(self, maxsize=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self.nbytes = 0
+            self.version = version
+
+    def get_or_compute(self, version, key, compute):
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Compute outside the lock; two sessions racing on the same key just both compute it
+        value = compute()
+        size = _nbytes(value)
+
+        with self._lock:
+            if version == self.version and size <= self.max_bytes:
+                if key in self._entries:
+                    self.nbytes -= self._entries[key][1]
+                self._entries[key] = (value, size)
+                self._entries.move_to_end(key)
+                self.nbytes += size
+                while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.nbytes -= evicted
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "max_entries": self.maxsize,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@st.cache_resource
+def get_query_cache():
+    return QueryCache()
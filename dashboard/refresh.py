@@ -0,0 +1,102 @@
+"""Background refresh of the shared dataset.
+
+A daemon thread revalidates the sheet every ``SNAPSHOT_TTL`` seconds.
+A changed export is validated and fully prepared (derived columns and all
+indexes) off the request path, then swapped in with a single reference
+assignment, so sessions only ever see a complete dataset and never wait on
+the network. An export that fails validation is logged and ignored, and
+the last good snapshot keeps being served.
+"""
+import logging
+import threading
+import time
+
+from dashboard.data import SNAPSHOT_TTL, mark_fresh, save_snapshot
+from dashboard.ingest import fetch_update
+
+log = logging.getLogger(__name__)
+
+# Every source column the pages and the static export read directly
+REQUIRED_COLUMNS = ["Distributor", "Supplier", "ProductName", "Category", "Standard"]
+MIN_ROW_RATIO = 0.5  # reject exports that lose more than half of the rows at once
+LOST_FLAGS = {"campus_bits": "campus", "aggregator_bits": "AASHE/PGH", "cert_bits": "certification"}
+
+
+def validate(df, previous=None):
+    """Raise ValueError if ``df`` doesn't look like a usable export."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    if df.empty:
+        raise ValueError("the export has no rows")
+    if previous is not None:
+        if len(df) < MIN_ROW_RATIO * len(previous):
+            raise ValueError(f"only {len(df)} rows, down from {len(previous)}")
+        # apply_schema always creates the packed groups, so a dropped or renamed column shows up as no flags set
+        for group, what in LOST_FLAGS.items():
+            if previous[group].any() and not df[group].any():
+                raise ValueError(f"no {what} flags are set (were the {what} columns renamed?)")
+
+
+class Refresher:
+    def __init__(self, prepare, df, meta, interval=SNAPSHOT_TTL):
+        self._prepare = prepare
+        self._dataset = prepare(df, meta)
+        self._meta = meta
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+        self.interval = interval
+        self.last_checked = None
+        self.last_error = None
+        self.swaps = 0
+
+    @property
+    def current(self):
+        return self._dataset
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # A snapshot fetched less than one interval ago doesn't need checking yet
+        delay = max(0, self._meta.get("fetched_at", 0) + self.interval - time.time())
+        while not self._stop.wait(delay):
+            self.refresh_once()
+            delay = self.interval
+
+    def refresh_once(self):
+        # One refresh at a time, but readers of ``current`` never take this lock
+        with self._lock:
+            try:
+                update = fetch_update(self._meta)
+                if update is None:
+                    self._meta = mark_fresh(self._meta)
+                else:
+                    df, meta = update
+                    validate(df, self._dataset.df)
+                    # Prepared before saving, so a frame that can't be prepared never becomes the snapshot
+                    dataset = self._prepare(df, meta)
+                    save_snapshot(df, meta)
+                    self._dataset, self._meta = dataset, meta
+                    self.swaps += 1
+                    log.info("Swapped in dataset version %s", meta.get("version"))
+                self.last_error = None
+            except Exception as e:  # keep serving the last good dataset whatever went wrong
+                self.last_error = f"{type(e).__name__}: {e}"
+                log.warning("Dataset refresh failed: %s", self.last_error)
+            self.last_checked = time.time()
+
+    def status(self):
+        return {
+            "version": self._dataset.version,
+            "source": self._dataset.source,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+            "swaps": self.swaps,
+            "interval": self.interval,
+        }
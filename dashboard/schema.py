@@ -0,0 +1,130 @@
+"""Declared column schema, applied once when a snapshot is ingested.
+
+Repeated strings become categoricals, and the 0/1 campus, certification
+and aggregator flag columns (blank means 0) are packed into one unsigned
+integer column per group: bit i of ``campus_bits`` is ``campus_cols[i]``
+and so on. The individual flag columns are dropped; use ``flag()`` to read
+one back, and ``unpack_flags()`` to restore them for exports. The source
+column order is kept in ``df.attrs["source_columns"]`` (it survives
+slicing and the parquet snapshot), so exports keep the sheet's layout.
+``or_by_group()`` and ``bit_matrix()`` are the shared helpers for
+aggregating and counting packed masks.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.campuses import campus_cols
+from dashboard.certifications import sustainability_dict
+
+# Bump when the stored snapshot layout changes so old snapshots are refetched
+SCHEMA_VERSION = 4
+
+CATEGORICAL_COLUMNS = ["Distributor", "Supplier", "Category", "Standard"]
+# Free text, kept verbatim (IDs like 00123 must not turn into floats)
+TEXT_COLUMNS = ["ProductName", "Internal_ID_Reference_Number"]
+
+FLAG_GROUPS = {
+    "campus_bits": list(campus_cols),
+    "cert_bits": list(sustainability_dict),
+    "aggregator_bits": ["AASHE", "PGH"],
+}
+_FLAG_LOCATION = {name: (group, bit) for group, names in FLAG_GROUPS.items() for bit, name in enumerate(names)}
+
+
+def _bits_dtype(width):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if width <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Too many flags to pack into one column: {width}")
+
+
+def read_csv(source):
+    """Parse one CSV export straight into the schema."""
+    return apply_schema(pd.read_csv(source, dtype={col: str for col in TEXT_COLUMNS}))
+
+
+def apply_schema(df):
+    df.columns = df.columns.str.strip()
+    source_columns = list(df.columns)
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    packed = {}
+    for group, names in FLAG_GROUPS.items():
+        dtype = _bits_dtype(len(names))
+        bits = np.zeros(len(df), dtype=dtype)
+        for bit, name in enumerate(names):
+            if name in df.columns:
+                on = pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy() == 1
+                bits |= on.astype(dtype) << dtype(bit)
+        packed[group] = bits
+
+    df = df.drop(columns=[name for name in _FLAG_LOCATION if name in df.columns]).assign(**packed)
+    df.attrs["source_columns"] = source_columns
+    return df
+
+
+def concat_frames(frames):
+    """Stack frames that already went through ``apply_schema``, keeping the schema."""
+    df = pd.concat(frames, ignore_index=True)
+    # Union of the source layouts, in first-seen order
+    source_columns = {}
+    for frame in frames:
+        source_columns.update(dict.fromkeys(frame.attrs.get("source_columns", [])))
+    df.attrs["source_columns"] = list(source_columns)
+    for col in CATEGORICAL_COLUMNS:
+        # Categoricals with different categories concatenate to object, so recast
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for group, names in FLAG_GROUPS.items():
+        if group in df.columns:
+            df[group] = df[group].fillna(0).astype(_bits_dtype(len(names)))
+    return df
+
+
+def flag(df, name):
+    """Boolean array of one packed flag (e.g. ``"UCLA"``, ``"OG"`` or ``"AASHE"``)."""
+    group, bit = _FLAG_LOCATION[name]
+    if group not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    bits = df[group].to_numpy()
+    return (bits >> bits.dtype.type(bit)) & 1 == 1
+
+
+def or_by_group(codes, masks, n_groups):
+    """OR of the packed ``masks`` per group: entry g covers the rows with code g (negative codes are skipped)."""
+    if len(codes) and codes.min() < 0:
+        known = codes >= 0
+        codes, masks = codes[known], masks[known]
+    merged = np.zeros(n_groups, dtype=masks.dtype)
+    np.bitwise_or.at(merged, codes, masks)
+    return merged
+
+
+def bit_matrix(masks, width):
+    """0/1 matrix of the packed ``masks``: one row per mask, one column per low bit."""
+    masks = np.asarray(masks).astype(np.uint64)
+    return (masks[:, None] >> np.arange(width, dtype=np.uint64) & np.uint64(1)).astype(np.int64)
+
+
+def unpack_flags(frame):
+    """Expand the packed flag groups back into one 0/1 column per flag.
+
+    With ``attrs["source_columns"]`` the flags the source had are put back in
+    their original positions and derived columns follow; otherwise every
+    flag is appended.
+    """
+    rest = frame.drop(columns=[g for g in FLAG_GROUPS if g in frame.columns])
+    source_columns = frame.attrs.get("source_columns")
+    if source_columns is None:
+        names = list(_FLAG_LOCATION)
+    else:
+        names = [c for c in source_columns if c in _FLAG_LOCATION]
+    flags = pd.DataFrame({name: flag(frame, name).astype(np.uint8) for name in names}, index=frame.index)
+    unpacked = pd.concat([rest, flags], axis=1)
+    if source_columns is None:
+        return unpacked
+    order = [c for c in source_columns if c in unpacked.columns]
+    return unpacked[order + [c for c in unpacked.columns if c not in set(order)]]
@@ -0,0 +1,131 @@
+"""Typo-tolerant product search over a prebuilt trigram index.
+
+Each searchable column is factorized and its distinct values are broken
+into character trigrams (encoded as small integers) once per dataset
+version. A query looks up the
+posting lists of its own trigrams, scores each distinct value by the share
+of query trigrams it contains, and maps the matching values back to rows,
+so it never scans the rows or compares strings pairwise.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ("ProductName", "Supplier", "Distributor")
+MIN_SCORE = 0.5  # share of query trigrams a value must contain to match
+
+# After normalization text only holds these symbols, so a trigram fits in one small integer
+ALPHABET = " 0123456789abcdefghijklmnopqrstuvwxyz"
+N_SYMBOLS = len(ALPHABET)
+N_GRAMS = N_SYMBOLS ** 3
+_SYMBOL = np.zeros(256, dtype=np.int64)
+_SYMBOL[np.frombuffer(ALPHABET.encode(), dtype=np.uint8)] = np.arange(N_SYMBOLS)
+
+_NON_ALNUM = r"[^0-9a-z]+"
+
+
+def normalize(text):
+    return re.sub(_NON_ALNUM, " ", str(text).lower()).strip()
+
+
+def _pad(text):
+    return f"  {text} "
+
+
+def trigrams(text):
+    """Integer codes of the trigrams of an already normalized string."""
+    symbols = _SYMBOL[np.frombuffer(_pad(text).encode(), dtype=np.uint8)]
+    return set((symbols[:-2] * N_SYMBOLS ** 2 + symbols[1:-1] * N_SYMBOLS + symbols[2:]).tolist())
+
+
+def _csr(keys, values, n_keys):
+    """Group ``values`` by integer ``keys`` into (ordered values, offsets)."""
+    order = np.argsort(keys, kind="stable")
+    offsets = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=offsets[1:])
+    return values[order], offsets
+
+
+def _gather(values, offsets, ids):
+    """Concatenate the CSR slices for ``ids`` without a Python loop."""
+    starts = offsets[ids]
+    lengths = offsets[ids + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=values.dtype), lengths
+    shifts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return values[np.arange(total) + shifts], lengths
+
+
+class _FieldIndex:
+    def __init__(self, series):
+        codes, uniques = series.factorize()
+        n_values = len(uniques)
+
+        # Trigram codes for every distinct value at once, over one concatenated buffer
+        padded = pd.Series(uniques, dtype=object).astype(str).str.lower()
+        padded = "  " + padded.str.replace(_NON_ALNUM, " ", regex=True).str.strip() + " "
+        lengths = padded.str.len().to_numpy(dtype=np.int64)
+        symbols = _SYMBOL[np.frombuffer("".join(padded).encode(), dtype=np.uint8)]
+        grams = symbols[:-2] * N_SYMBOLS ** 2 + symbols[1:-1] * N_SYMBOLS + symbols[2:]
+        value_of = np.repeat(np.arange(n_values), lengths)[:-2]
+        offset_in_value = np.arange(len(grams)) - np.repeat(np.cumsum(lengths) - lengths, lengths)[:-2]
+        inside = offset_in_value <= lengths[value_of] - 3
+
+        # Distinct (value, trigram) pairs. Keys arrive grouped by value, which suits the
+        # stable (run-aware) sort; regrouping by trigram is then a radix sort on uint16.
+        keys = np.sort(value_of[inside] * N_GRAMS + grams[inside], kind="stable")
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        value_col, gram_col = np.divmod(keys, N_GRAMS)
+        self.postings, self.posting_offsets = _csr(gram_col.astype(np.uint16), value_col.astype(np.int32), N_GRAMS)
+        self.value_grams = np.bincount(value_col, minlength=n_values)
+
+        known = codes >= 0
+        self.rows, self.row_offsets = _csr(codes[known], np.flatnonzero(known), n_values)
+
+    def match(self, grams, min_score):
+        """Rows whose value contains enough of ``grams``, with each row's score."""
+        hits, _ = _gather(self.postings, self.posting_offsets, np.fromiter(grams, dtype=np.int64))
+        if not len(hits):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        value_ids, overlap = np.unique(hits, return_counts=True)
+        coverage = overlap / len(grams)
+        keep = coverage >= min_score
+        value_ids, coverage = value_ids[keep], coverage[keep]
+        # Prefer values that are mostly made of the query over long values that merely contain it
+        score = coverage + 0.1 * overlap[keep] / self.value_grams[value_ids]
+        rows, lengths = _gather(self.rows, self.row_offsets, value_ids.astype(np.int64))
+        return rows, np.repeat(score, lengths)
+
+
+class TrigramIndex:
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.fields = [_FieldIndex(df[c]) for c in columns if c in df.columns]
+
+    def search(self, query, within=None, min_score=MIN_SCORE):
+        """Row positions matching ``query``, best first.
+
+        ``within`` optionally restricts the result to these (sorted) row positions,
+        e.g. the current sidebar selection.
+        """
+        query = normalize(query)
+        if not query:
+            return np.empty(0, dtype=np.int64)
+        grams = trigrams(query)
+
+        matched = [field.match(grams, min_score) for field in self.fields]
+        rows = np.concatenate([r for r, _ in matched])
+        scores = np.concatenate([s for _, s in matched])
+        if within is not None:
+            keep = np.isin(rows, within, assume_unique=False)
+            rows, scores = rows[keep], scores[keep]
+        if not len(rows):
+            return rows
+
+        # A row can match on several columns: keep its best score, then rank
+        order = np.lexsort((-scores, rows))
+        rows, scores = rows[order], scores[order]
+        first = np.concatenate(([True], rows[1:] != rows[:-1]))
+        rows, scores = rows[first], scores[first]
+        return rows[np.lexsort((rows, -scores))]
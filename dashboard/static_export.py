@@ -0,0 +1,262 @@
+"""Static snapshot of the read-only parts of the dashboard.
+
+Most viewers only read the glossary, the certification totals and the
+distributor / supplier product lists. This renders those to plain HTML,
+PNG and CSV files under ``dist/<version>/``, which any file server or CDN
+can serve without a Streamlit process or a login:
+
+    python -m dashboard.static_export            # local snapshot or bundled CSV
+    python -m dashboard.static_export --fetch    # pull the sources first
+
+Dataset versions are content hashes, so a bundle never changes once built:
+an existing version is left alone unless ``--force`` is given, and every
+file under it can be served with a long cache lifetime. ``dist/index.html``
+and ``dist/latest.json`` point at the newest build.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from dashboard.certifications import stats_certifications, sustainability_dict
+from dashboard.charts import render_barh_png
+from dashboard.data import ROOT, load_local, save_snapshot
+from dashboard.dataset import prepare
+from dashboard.dedup import merged_listings
+from dashboard.exports import to_bytes
+from dashboard.ingest import fetch_update
+from dashboard.refresh import validate
+
+DIST_DIR = ROOT / "dist"
+GUIDE = ROOT / "static" / "Brief_guide_on_UC_Sustainable_Purchasing.pdf"
+MAX_TABLE_ROWS = 1000  # longer product lists are cut short in HTML; the CSV has every row
+
+STYLE = """
+body { font-family: system-ui, sans-serif; max-width: 70rem; margin: 2rem auto; padding: 0 1rem; color: #222; }
+table { border-collapse: collapse; margin: 1rem 0; font-size: 0.9rem; }
+th, td { border-bottom: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: left; vertical-align: top; }
+th { background: #f5f5f5; }
+nav a { margin-right: 1rem; }
+.note { color: #666; }
+"""
+
+
+def _slug(name):
+    base = re.sub(r"[^a-z0-9]+", "-", str(name).lower()).strip("-")[:60] or "entry"
+    # Different names can share a slug ("A&B" / "A B"), so add a short hash of the name
+    return f"{base}-{hashlib.sha1(str(name).encode()).hexdigest()[:6]}"
+
+
+def _table(frame, links=None):
+    """HTML table of ``frame``; ``links`` maps a column to the hrefs of its cells."""
+    cells = frame.astype(object).where(frame.notna(), "").map(lambda v: html.escape(str(v)))
+    cells.columns = [html.escape(str(c)) for c in frame.columns]
+    for col, hrefs in (links or {}).items():
+        cells[col] = [f'<a href="{href}">{text}</a>' for href, text in zip(hrefs, cells[col])]
+    return cells.to_html(index=False, border=0, escape=False)
+
+
+def _page(title, body, depth=0):
+    up = "../" * depth
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<link rel="stylesheet" href="{up}style.css">
+</head>
+<body>
+<nav><a href="{up}index.html">Overview</a><a href="{up}distributors/index.html">Distributors</a><a href="{up}suppliers/index.html">Suppliers</a></nav>
+<h1>{html.escape(title)}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+class _Bundle:
+    """Writes files under one directory and remembers them for the manifest."""
+
+    def __init__(self, root):
+        self.root = root
+        self.files = {}
+
+    def write(self, path, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        target = self.root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        self.files[path] = {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _overview(bundle, df, cert_stats, meta):
+    n_products = cert_stats.n_products
+    parts = [
+        f'<p class="note">Data version {html.escape(meta.get("version", ""))}, built'
+        f' {time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime())}. {len(df):,} product listings from all campuses,'
+        f' {n_products:,} distinct products after merging near-duplicate names.</p>',
+        "<h2>Glossary of Certification Terms</h2>",
+        "<dl>" + "".join(f"<dt><b>{html.escape(k)}</b></dt><dd>{html.escape(v)}</dd>" for k, v in sustainability_dict.items()) + "</dl>",
+    ]
+    if GUIDE.exists():
+        bundle.write(f"guide/{GUIDE.name}", GUIDE.read_bytes())
+        parts.append(f'<p><a href="guide/{GUIDE.name}">📥 Brief Guide on UC Sustainable Purchasing (PDF)</a></p>')
+
+    parts.append("<h2>Distribution of Certifications Across All Products</h2>")
+    counts = cert_stats.cert_counts(names=stats_certifications)
+    if counts:
+        bundle.write("charts/certifications.png", render_barh_png(
+            tuple(counts), tuple(counts.values()), (4, 3), "Number of Products", "Certification"))
+        parts.append('<img src="charts/certifications.png" alt="Products per certification" width="480">')
+        parts.append(_table(pd.DataFrame({"Certification": list(counts), "Products": list(counts.values())})))
+    else:
+        parts.append("<p>No sustainability certifications found.</p>")
+
+    parts.append("<h2>Certifications by Campus</h2>")
+    campus_table = cert_stats.campus_by_cert()
+    campus_table = campus_table.loc[campus_table.sum(axis=1) > 0, campus_table.sum(axis=0) > 0]
+    if campus_table.empty:
+        parts.append("<p>No campus purchases with sustainability certifications found.</p>")
+    else:
+        parts.append(_table(campus_table.rename_axis("Campus").reset_index()))
+
+    parts.append("<h2>Certifications by Distributor</h2>")
+    breakdown = cert_stats.distributor_breakdown()
+    breakdown = breakdown.loc[:, breakdown.sum(axis=0) > 0].sort_values("Products", ascending=False).reset_index()
+    parts.append(_table(breakdown, links={"Distributor": [f"distributors/{_slug(d)}.html" for d in breakdown["Distributor"]]}))
+
+    merged = merged_listings(df)
+    if not merged.empty:
+        parts.append(f"<h2>Merged Listings</h2><p>{len(merged):,} products are listed under several names.</p>")
+        parts.append(_table(merged.head(MAX_TABLE_ROWS)))
+
+    parts.append("<h2>Downloads</h2><ul>")
+    for fmt, name in [("CSV", "products.csv"), ("CSV (gzip)", "products.csv.gz")]:
+        bundle.write(f"downloads/{name}", to_bytes(df, fmt))
+        parts.append(f'<li><a href="downloads/{name}">All products ({fmt})</a></li>')
+    parts.append("</ul>")
+
+    bundle.write("index.html", _page("UC Sustainable Procurement Dashboard", "\n".join(parts)))
+
+
+def _entities(bundle, df, entries, column, counterpart):
+    """An index page plus one page and one CSV per distributor or supplier."""
+    folder, other_folder = f"{column.lower()}s", f"{counterpart.lower()}s"
+    product_cols = ['ProductName', counterpart, 'Category', 'Standard', 'Full Campus Names']
+    rows = []
+    for name, entry in entries.items():
+        slug = _slug(name)
+        frame = df.take(entry.positions)
+        bundle.write(f"{folder}/{slug}.csv", to_bytes(frame, "CSV"))
+
+        others = ", ".join(f'<a href="../{other_folder}/{_slug(o)}.html">{html.escape(o)}</a>' for o in entry.counterparts)
+        campuses = ", ".join(entry.campuses) or "No campus purchases found."
+        categories = ", ".join(f"{category} ({count})" for category, count in entry.category_counts.items())
+        parts = [
+            f"<h2>{counterpart}s</h2><p>{others}</p>",
+            f"<h2>Campuses Purchasing</h2><p>{html.escape(campuses)}</p>",
+            f'<h2>Products</h2><p class="note">By category: {html.escape(categories)}</p>',
+            f'<p><a href="{slug}.csv">📥 Download all {len(frame):,} products (CSV)</a></p>',
+            _table(frame[product_cols].head(MAX_TABLE_ROWS).rename(columns={'Full Campus Names': 'Campuses Procuring'})),
+        ]
+        if len(frame) > MAX_TABLE_ROWS:
+            parts.append(f'<p class="note">Showing the first {MAX_TABLE_ROWS:,} of {len(frame):,} products; the CSV has them all.</p>')
+        bundle.write(f"{folder}/{slug}.html", _page(f"{column}: {name}", "\n".join(parts), depth=1))
+        rows.append({
+            column: name,
+            f"{counterpart}s": len(entry.counterparts),
+            "Products": len(entry.positions),
+            "Campuses Procuring": ", ".join(entry.campuses),
+        })
+
+    table = pd.DataFrame(rows, columns=[column, f"{counterpart}s", "Products", "Campuses Procuring"])
+    links = {column: [f"{_slug(name)}.html" for name in table[column]]}
+    bundle.write(f"{folder}/index.html", _page(f"{column}s", _table(table, links=links), depth=1))
+
+
+def _write_atomic(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build(df, meta, out_dir=DIST_DIR, force=False, dataset=None):
+    """Write the bundle for ``meta["version"]``: ``(path, built)``; ``built`` is False if it already existed.
+
+    ``dataset`` is ``df`` already prepared, if the caller has it.
+    """
+    target = out_dir / meta.get("version", "")
+    if target.exists() and not force:
+        return target, False
+    if dataset is None:
+        dataset = prepare(df, meta)
+
+    # Built next to the target and renamed into place, so a server never sees half a bundle
+    out_dir.mkdir(parents=True, exist_ok=True)
+    staging = out_dir / f".{dataset.version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    bundle = _Bundle(staging)
+    bundle.write("style.css", STYLE)
+    _overview(bundle, dataset.df, dataset.cert_stats, meta)
+    _entities(bundle, dataset.df, dataset.entity_index.distributors, 'Distributor', 'Supplier')
+    _entities(bundle, dataset.df, dataset.entity_index.suppliers, 'Supplier', 'Distributor')
+    manifest = {
+        "version": dataset.version,
+        "source": dataset.source,
+        "built_at": time.time(),
+        "rows": len(dataset.df),
+        "files": bundle.files,
+    }
+    (staging / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    if target.exists():
+        shutil.rmtree(target)
+    os.replace(staging, target)
+
+    # Small, short-lived pointers to the newest version
+    _write_atomic(out_dir / "latest.json", json.dumps({"version": dataset.version, "path": f"{dataset.version}/index.html"}))
+    _write_atomic(out_dir / "index.html", (
+        f'<!DOCTYPE html><meta charset="utf-8"><meta http-equiv="refresh" content="0; url={dataset.version}/index.html">'
+        f'<a href="{dataset.version}/index.html">UC Sustainable Procurement Dashboard</a>\n'
+    ))
+    return target, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the read-only dashboard views to a static bundle.")
+    parser.add_argument("--fetch", action="store_true", help="check the sources for new data before building")
+    parser.add_argument("--out", type=Path, default=DIST_DIR, help=f"output directory (default: {DIST_DIR})")
+    parser.add_argument("--force", action="store_true", help="rebuild even if this version was already built")
+    args = parser.parse_args()
+
+    df, meta = load_local()
+    dataset = None
+    started = time.perf_counter()
+    if args.fetch:
+        update = fetch_update(meta)
+        if update is not None:
+            validate(update[0], df)
+            df, meta = update
+            # Prepared before saving, as in the refresher, so a frame that can't be prepared never becomes the snapshot
+            dataset = prepare(df, meta)
+            save_snapshot(df, meta)
+
+    target, built = build(df, meta, args.out, args.force, dataset=dataset)
+    if built:
+        files = json.loads((target / "manifest.json").read_text())["files"]
+        size = sum(f["bytes"] for f in files.values())
+        print(f"wrote {target}: {len(files):,} files, {size / 1e6:,.1f} MB in {time.perf_counter() - started:,.1f}s")
+    else:
+        print(f"{target} is up to date (use --force to rebuild)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Server-side paginated product tables.
+
+Sorting and paging happen on the server, and only the visible window of
+rows is sent to the browser; the total row count is shown separately. Only
+that window is taken from the dataset frame. The sort order of a selection
+is computed once from the sort column alone and kept in the shared query
+cache, so paging through it costs one small take per rerun.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard.perf import span
+from dashboard.query_cache import get_query_cache
+
+PAGE_SIZES = [25, 50, 100, 250]
+NO_SORT = "(original order)"
+
+
+def _sort_order(series, descending):
+    """Row positions that sort ``series`` (missing values last), stable."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Sort by label, not by category code (derived columns are coded by campus mask)
+        labels = series.cat.categories.astype(str)
+        rank = np.empty(len(labels), dtype=np.int64)
+        rank[np.argsort(labels, kind="stable")] = np.arange(len(labels))
+        codes = series.cat.codes.to_numpy()
+        series = pd.Series(np.where(codes >= 0, rank[codes], np.nan))
+    return (
+        series.reset_index(drop=True)
+        .sort_values(ascending=not descending, kind="stable", na_position="last")
+        .index.to_numpy()
+    )
+
+
+def paginated_table(dataset, selection, columns, key, rename=None):
+    """Show one page of the ``selection``'s rows of ``dataset.df[columns]``, sorted as chosen by the user."""
+    df = dataset.df
+    positions = selection.positions
+    total = len(positions)
+
+    sort_col, order_col, size_col = st.columns(3)
+    sort_by = sort_col.selectbox("Sort by", [NO_SORT] + columns, key=f"{key}_sort",
+                                 format_func=lambda c: (rename or {}).get(c, c))
+    descending = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+
+    n_pages = max(1, math.ceil(total / page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1  # the selection shrank under the current page
+    page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+    with span("table.page", sorted=sort_by != NO_SORT):
+        if sort_by == NO_SORT:
+            rows = positions[start:end]
+        else:
+            order = get_query_cache().get_or_compute(
+                dataset.version, ("sort", sort_by, descending) + selection.key,
+                lambda: _sort_order(df[sort_by].take(positions), descending),
+            )
+            rows = positions[order[start:end]]
+
+        window = df.take(rows)[columns]
+        if rename:
+            window = window.rename(columns=rename)
+    st.dataframe(window, hide_index=True)
+    st.caption(f"Showing rows {start + 1:,}–{end:,} of {total:,}" if total else "No rows")
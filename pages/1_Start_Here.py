@@ -1,13 +1,14 @@
 import streamlit as st
-import pandas as pd
-import base64
 from pathlib import Path
+from dashboard.certifications import sustainability_dict
+from dashboard.perf import track_session
 
 if st.session_state.get("authentication_status") != True:
     st.info("Please log in on the app page to continue.")
     st.stop()
 
 st.set_page_config(page_title="Start Here", page_icon="📈")
+track_session("Start Here")
 
 # Load data
 st.title("UC Sustainable Procurement Dashboard")
@@ -26,6 +27,7 @@ It is our hope that this tool will help your campus to identify further opportun
 - Search for food items by category, certification, campus, or region
 - Explore supplier and distributor offerings
 - View summaries of sustainability certifications
+- Compare which campuses buy the same products and suppliers
 
 ### What do we consider "Sustainable"
             
@@ -43,68 +45,58 @@ Education's Sustainability Tracking, Assessment & Rating System (AASHE STARS)](h
             
 """)
 
-sustainability_dict = {
-    "OG": "Organic",
-    "CH": "Certified Humane",
-    "FT": "Fair Trade",
-    "RAC": "Regenerative Ag.",
-    "AGA": "Grassfed Assoc.",
-    "AWA": "Animal Welfare",
-    "GAP": "Global Animal Partnership",
-    "AHC": "American Humane Certified",
-    "HFAC": "Humane Farm Care",
-    "MSC": "Marine Stewardship Council",
-    "BAP": "Best Aquaculture Practices",
-    "MBA": "Monterrey Bay Aquarium",
-    "WWF": "WWF/Good Fish Foundation",
-    "OWR": "Ocean Wise Recommended",
-    "SSB": "Sailors for the Sea Blue list",
-    "SFSC": "Short Food supply chain",
-    "SP": "Small producer",
-    "BFC": "Bird Friendly Coffee",
-    "BBC": "Bee Better Certified (Xerces Society)",
-    "FAC": "Food Alliance Certified",
-    "SPP": "Small Producers Symbol",
-    "EFI": "Equitable Food Initiative",
-    "MWD": "Milk with Dignity",
-    "NAE": "No Antibiotics Ever"
-}
-
 # Glossary section
 st.subheader("Glossary of Certification Terms")
 for short, full in sustainability_dict.items():
     st.markdown(f"**{short}**: {full}")
 
 # ---- PDF widget (viewer + download) ----
+# The guide is served by Streamlit's static file server (see .streamlit/config.toml),
+# so browsers fetch and cache it by URL instead of it riding along on every rerun.
 st.subheader("Brief Guide on UC Sustainable Purchasing")
 
-pdf_path = Path("Brief_guide_on_UC_Sustainable_Purchasing.pdf")
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+GUIDE_NAME = "Brief_guide_on_UC_Sustainable_Purchasing.pdf"
+GUIDE_URL = f"app/static/{GUIDE_NAME}"
+
 
-if pdf_path.exists():
-    pdf_bytes = pdf_path.read_bytes()
+@st.cache_resource
+def guide_thumbnails():
+    # Page images from scripts/build_guide_thumbnails.py, listed once per process
+    return [p.name for p in sorted((STATIC_DIR / "guide_pages").glob("page-*.png"))]
 
-    # Download button
-    st.download_button(
-        label="📥 Download as PDF",
-        data=pdf_bytes,
-        file_name=pdf_path.name,
-        mime="application/pdf",
+
+if (STATIC_DIR / GUIDE_NAME).exists():
+    st.markdown(
+        f'<a href="{GUIDE_URL}" download="{GUIDE_NAME}">📥 Download as PDF</a>'
+        f' &nbsp;·&nbsp; <a href="{GUIDE_URL}" target="_blank">Open in a new tab</a>',
+        unsafe_allow_html=True,
     )
 
-    # Scrollable embedded viewer (iframe)
-    base64_pdf = base64.b64encode(pdf_bytes).decode("utf-8")
-    pdf_display = f"""
-        <iframe
-            src="data:application/pdf;base64,{base64_pdf}"
-            width="100%"
-            height="800"
-            style="border: 1px solid #ddd;"
-        ></iframe>
-    """
-    st.markdown(pdf_display, unsafe_allow_html=True)
+    # Lazy-loaded page thumbnails, each linking to that page of the full guide
+    thumbnails = "".join(
+        f'<a href="{GUIDE_URL}#page={i}" target="_blank">'
+        f'<img src="app/static/guide_pages/{name}" loading="lazy" width="180" alt="Guide page {i}"'
+        f' style="border: 1px solid #ddd; margin: 0 8px 8px 0;"></a>'
+        for i, name in enumerate(guide_thumbnails(), start=1)
+    )
+    if thumbnails:
+        st.markdown(thumbnails, unsafe_allow_html=True)
+
+    # Scrollable embedded viewer (iframe), only fetched once the expander is opened
+    with st.expander("Read the full guide here"):
+        st.markdown(f"""
+            <iframe
+                src="{GUIDE_URL}"
+                loading="lazy"
+                width="100%"
+                height="800"
+                style="border: 1px solid #ddd;"
+            ></iframe>
+        """, unsafe_allow_html=True)
 
 else:
-    st.warning(f"PDF not found at: {pdf_path.resolve()}")
+    st.warning(f"PDF not found at: {(STATIC_DIR / GUIDE_NAME).resolve()}")
 
 st.markdown("""
 ---
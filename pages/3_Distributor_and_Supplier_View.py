@@ -1,42 +1,24 @@
 import streamlit as st
-import pandas as pd
+from dashboard.dataset import get_dataset
+from dashboard.exports import download_button
+from dashboard.perf import track_session
+from dashboard.queries import entity_selection
+from dashboard.table import paginated_table
 
 if st.session_state.get("authentication_status") != True:
     st.info("Please log in on the app page to continue.")
     st.stop()
 
 st.set_page_config(page_title="Distributor & Supplier View", layout="wide")
+track_session("Distributor & Supplier View")
+
+# Shared prepared dataset (read-only; includes the derived campus columns)
+dataset = get_dataset()
+
+
+def category_summary(entry):
+    return "By category: " + ", ".join(f"{category} ({count})" for category, count in entry.category_counts.items())
 
-# Load data from public Google Sheet
-@st.cache_data
-def load_data():
-    url = "https://docs.google.com/spreadsheets/d/1qsapyNmZleoL75aIwH57W3nqTc_VLhdbFEieOTwYWiI/export?format=csv"
-    df = pd.read_csv(url)
-    df.columns = df.columns.str.strip()
-    return df
-
-df = load_data()
-
-
-# Campus mapping and helpers
-campus_name_map = {
-    "UCLA": "UCLA",
-    "UCD_H": "UC Davis Health",
-    "UCB": "UC Berkeley",
-    "UCR": "UC Riverside",
-    "UCM": "UC Merced",
-    "UCSC": "UC Santa Cruz",
-    "UCSD_H": "UC San Diego Health",
-    "UCLA_H": "UCLA Health",
-    "UCD": "UC Davis"
-}
-campus_cols = list(campus_name_map.keys())
-
-def list_campuses(row):
-    campuses = [c for c in campus_cols if c in row and row[c] == 1]
-    return ", ".join([campus_name_map[c] for c in campuses])
-
-df['Campuses Procuring'] = df.apply(list_campuses, axis=1)
 
 st.markdown("""
 # Distributor and Supplier View
@@ -45,18 +27,17 @@ Use this page to explore the sustainable offerings that distributors and supplie
 
 st.title("Explore by Distributor")
 
-distributors = sorted(df['Distributor'].dropna().unique())
+distributors = list(dataset.entity_index.distributors)
 selected_distributor = st.selectbox("Select a Distributor", distributors, key="distributor_select")
 
-dist_df = df[df['Distributor'] == selected_distributor]
-if dist_df.empty:
+dist_sel = entity_selection(dataset, 'Distributor', selected_distributor)
+if not len(dist_sel):
     st.warning("No products found for this distributor.")
 else:
     st.subheader(f"Suppliers Provided by {selected_distributor}")
-    suppliers = sorted(dist_df['Supplier'].dropna().unique())
-    st.write(", ".join(suppliers))
+    st.write(", ".join(dist_sel.suppliers))
 
-    campuses_procuring = [campus_name_map[c] for c in campus_cols if c in dist_df.columns and dist_df[c].sum() > 0]
+    campuses_procuring = dist_sel.campuses
     st.subheader(f"Campuses Purchasing from {selected_distributor}")
     if campuses_procuring:
         st.write(", ".join(campuses_procuring))
@@ -64,31 +45,38 @@ else:
         st.write("No campus purchases found for this distributor.")
 
     st.subheader("Products from This Distributor")
-    st.dataframe(dist_df[['ProductName', 'Supplier', 'Category', 'Standard', 'Campuses Procuring']])
+    st.caption(category_summary(dataset.entity_index.distributors[selected_distributor]))
+    paginated_table(
+        dataset,
+        dist_sel,
+        ['ProductName', 'Supplier', 'Category', 'Standard', 'Full Campus Names'],
+        key="distributor_table",
+        rename={'Full Campus Names': 'Campuses Procuring'},
+    )
 
-    st.download_button(
-        label="📥 Download Distributor Products",
-        data=dist_df.to_csv(index=False),
-        file_name=f"{selected_distributor.replace(' ', '_')}_products.csv",
-        mime="text/csv"
+    download_button(
+        "📥 Download Distributor Products",
+        dataset,
+        dist_sel,
+        f"{selected_distributor.replace(' ', '_')}_products",
+        key="distributor_download",
     )
 
 st.markdown("---")
 
 st.title("Explore by Supplier")
 
-suppliers = sorted(df['Supplier'].dropna().unique())
+suppliers = list(dataset.entity_index.suppliers)
 selected_supplier = st.selectbox("Select a Supplier", suppliers, key="supplier_select")
 
-supp_df = df[df['Supplier'] == selected_supplier]
-if supp_df.empty:
+supp_sel = entity_selection(dataset, 'Supplier', selected_supplier)
+if not len(supp_sel):
     st.warning("No products found for this supplier.")
 else:
     st.subheader(f"Distributors That Carry {selected_supplier}")
-    distros = sorted(supp_df['Distributor'].dropna().unique())
-    st.write(", ".join(distros))
+    st.write(", ".join(supp_sel.distributors))
 
-    campuses_procuring = [campus_name_map[c] for c in campus_cols if c in supp_df.columns and supp_df[c].sum() > 0]
+    campuses_procuring = supp_sel.campuses
     st.subheader(f"Campuses Purchasing from {selected_supplier}")
     if campuses_procuring:
         st.write(", ".join(campuses_procuring))
@@ -96,11 +84,33 @@ else:
         st.write("No campus purchases found for this supplier.")
 
     st.subheader("Products from This Supplier")
-    st.dataframe(supp_df[['ProductName', 'Distributor', 'Category', 'Standard', 'Campuses Procuring']])
+    st.caption(category_summary(dataset.entity_index.suppliers[selected_supplier]))
+    paginated_table(
+        dataset,
+        supp_sel,
+        ['ProductName', 'Distributor', 'Category', 'Standard', 'Full Campus Names'],
+        key="supplier_table",
+        rename={'Full Campus Names': 'Campuses Procuring'},
+    )
 
-    st.download_button(
-        label="📥 Download Supplier Products",
-        data=supp_df.to_csv(index=False),
-        file_name=f"{selected_supplier.replace(' ', '_')}_products.csv",
-        mime="text/csv"
+    download_button(
+        "📥 Download Supplier Products",
+        dataset,
+        supp_sel,
+        f"{selected_supplier.replace(' ', '_')}_products",
+        key="supplier_download",
     )
+
+st.markdown("---")
+
+st.title("Suppliers Available Through Several Distributors")
+st.markdown("Suppliers carried by more than one distributor give campuses a choice of how to source the same products.")
+
+max_distributors = dataset.entity_index.max_distributors
+if max_distributors < 2:
+    st.write("No supplier is currently carried by more than one distributor.")
+else:
+    min_distributors = 2
+    if max_distributors > 2:
+        min_distributors = st.slider("Minimum number of distributors", 2, max_distributors, 2, key="min_distributors")
+    st.dataframe(dataset.entity_index.multi_distributor_suppliers(min_distributors), hide_index=True)
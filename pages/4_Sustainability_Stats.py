@@ -1,54 +1,70 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+from dashboard.certifications import stats_certifications
+from dashboard.charts import barh_chart
+from dashboard.dataset import get_dataset
+from dashboard.perf import track_session
+from dashboard.queries import merged_products
 
 if st.session_state.get("authentication_status") != True:
     st.info("Please log in on the main page to continue.")
     st.stop()
 
 st.set_page_config(page_title="Sustainability Stats", page_icon="📈")
+track_session("Sustainability Stats")
 
 st.sidebar.header("Sustainability Stats")
 
-# Load data from public Google Sheet
-@st.cache_data
-def load_data():
-    url = "https://docs.google.com/spreadsheets/d/1qsapyNmZleoL75aIwH57W3nqTc_VLhdbFEieOTwYWiI/export?format=csv"
-    df = pd.read_csv(url)
-    df.columns = df.columns.str.strip()
-    return df
-
-df = load_data()
+# Shared prepared dataset (read-only)
+dataset = get_dataset()
+df = dataset.df
+cert_stats = dataset.cert_stats
 
 st.title("Sustainability Certifications Overview")
 
-sustainability_dict = {
-    "OG": "Organic",
-    "CH": "Certified Humane",
-    "FT": "Fair Trade",
-    "RAC": "Regenerative Ag.",
-    "AGA": "Grassfed Assoc.",
-    "AWA": "Animal Welfare",
-    "GAP": "Global Animal Partnership",
-    "AHC": "American Humane Certified",
-    "HFAC": "Humane Farm Care",
-    "MSC": "Marine Stewardship Council",
-    "BAP": "Best Aquaculture Practices",
-    "MBA": "Monterrey Bay Aquarium"
-}
-
-existing_cols = [col for col in sustainability_dict if col in df.columns]
-counts = {sustainability_dict[k]: df[k].sum() for k in existing_cols if df[k].sum() > 0}
+# Counts below are per product: listings of the same item under slightly different names count once
+n_products = cert_stats.n_products
+st.caption(f"{len(df):,} product listings from all campuses, {n_products:,} distinct products after merging near-duplicate names.")
+merged = merged_products(dataset)
+if not merged.empty:
+    with st.expander(f"Merged listings ({len(merged):,} products listed under several names)"):
+        st.dataframe(merged, hide_index=True)
+
+# Whole-dataset counts, computed once per data version (see dashboard.cert_stats)
+counts = cert_stats.cert_counts(names=stats_certifications)
 
 # Horizontal bar chart
 st.subheader("Distribution of Certifications Across All Products")
 if counts:
-    fig, ax = plt.subplots(figsize=(3, 2))
-    ax.barh(list(counts.keys()), list(counts.values()))
-    ax.set_xlabel("Number of Products")
-    ax.set_ylabel("Certification")
-    st.pyplot(fig)
+    barh_chart(counts, figsize=(3, 2))
 else:
     st.write("No sustainability certifications found.")
 
+# Campus x certification heatmap
+st.subheader("Certifications by Campus")
+campus_table = cert_stats.campus_by_cert()
+campus_table = campus_table.loc[campus_table.sum(axis=1) > 0, campus_table.sum(axis=0) > 0]
+if campus_table.empty:
+    st.write("No campus purchases with sustainability certifications found.")
+else:
+    heatmap = campus_table.rename_axis("Campus").reset_index().melt(
+        id_vars="Campus", var_name="Certification", value_name="Products"
+    )
+    st.vega_lite_chart(heatmap, {
+        "mark": "rect",
+        "encoding": {
+            "x": {"field": "Certification", "type": "nominal"},
+            "y": {"field": "Campus", "type": "nominal"},
+            "color": {"field": "Products", "type": "quantitative"},
+            "tooltip": [
+                {"field": "Campus"},
+                {"field": "Certification"},
+                {"field": "Products", "type": "quantitative"},
+            ],
+        },
+    })
 
+# Per-distributor breakdown
+st.subheader("Certifications by Distributor")
+breakdown = cert_stats.distributor_breakdown()
+breakdown = breakdown.loc[:, (breakdown.sum(axis=0) > 0)]
+st.dataframe(breakdown.sort_values("Products", ascending=False))
@@ -0,0 +1,73 @@
+import streamlit as st
+from dashboard.campuses import campus_name_map
+from dashboard.dataset import get_dataset
+from dashboard.overlap import MEASURES, campus_overlap
+from dashboard.perf import span, track_session
+
+if st.session_state.get("authentication_status") != True:
+    st.info("Please log in on the app page to continue.")
+    st.stop()
+
+st.set_page_config(page_title="Campus Overlap", page_icon="📈")
+track_session("Campus Overlap")
+
+st.sidebar.header("Campus Overlap")
+
+# Shared prepared dataset (read-only)
+dataset = get_dataset()
+
+st.title("Campus Overlap")
+st.markdown("""
+See which campuses buy the same sustainable products and work with the same suppliers, to spot group-purchasing opportunities.
+- **Shared products / suppliers** count the products or suppliers both campuses buy.
+- **Similarity** (Jaccard) is the shared count divided by the number bought by either campus: 1 means identical purchases, 0 means nothing in common.
+""")
+
+category = st.sidebar.selectbox("Select Food Category", ["All"] + list(dataset.filter_index.categories))
+measure = st.sidebar.selectbox("Measure", list(MEASURES))
+
+with span("overlap.compute", category=category):
+    overlap = campus_overlap(dataset, category)
+
+if len(overlap.active) < 2:
+    st.warning("Fewer than two campuses buy products in this category, so there is nothing to compare.")
+    st.stop()
+
+# Campus x campus heatmap of the chosen measure
+st.subheader(f"{measure} by Campus Pair")
+matrix = overlap.matrix(MEASURES[measure])
+heatmap = matrix.rename_axis("Campus").reset_index().melt(id_vars="Campus", var_name="Other Campus", value_name=measure)
+st.vega_lite_chart(heatmap, {
+    "mark": "rect",
+    "encoding": {
+        "x": {"field": "Other Campus", "type": "nominal"},
+        "y": {"field": "Campus", "type": "nominal"},
+        "color": {"field": measure, "type": "quantitative"},
+        "tooltip": [
+            {"field": "Campus"},
+            {"field": "Other Campus"},
+            {"field": measure, "type": "quantitative", "format": ".2f" if "Jaccard" in measure else "d"},
+        ],
+    },
+})
+
+st.subheader("Campus Pairs")
+st.dataframe(
+    overlap.pairs(),
+    hide_index=True,
+    column_config={
+        "Product similarity": st.column_config.NumberColumn(format="%.2f"),
+        "Supplier similarity": st.column_config.NumberColumn(format="%.2f"),
+    },
+)
+
+# Suppliers two campuses have in common
+st.subheader("Shared Suppliers")
+campus_codes = {campus_name_map[code]: code for code in overlap.active_codes}
+col1, col2 = st.columns(2)
+campus_a = col1.selectbox("Campus", list(campus_codes), key="overlap_campus_a")
+campus_b = col2.selectbox("Other campus", [c for c in campus_codes if c != campus_a], key="overlap_campus_b")
+shared = overlap.shared_suppliers(campus_codes[campus_a], campus_codes[campus_b])
+st.write(f"{campus_a} and {campus_b} share {len(shared)} {'supplier' if len(shared) == 1 else 'suppliers'}")
+if shared:
+    st.write(", ".join(shared))
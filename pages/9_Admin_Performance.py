@@ -0,0 +1,109 @@
+import json
+import time
+
+import pandas as pd
+import streamlit as st
+from dashboard.dataset import get_refresher
+from dashboard.exports import get_export_cache
+from dashboard.ingest import get_pipeline
+from dashboard.perf import process_memory, track_session, tracer
+from dashboard.query_cache import get_query_cache
+
+# Users from the auth config who may see this page
+ADMIN_USERS = {"analyst"}
+
+if st.session_state.get("authentication_status") != True:
+    st.info("Please log in on the app page to continue.")
+    st.stop()
+
+if st.session_state.get("username") not in ADMIN_USERS:
+    st.error("This page is only available to dashboard administrators.")
+    st.stop()
+
+st.set_page_config(page_title="Admin: Performance", page_icon="⏱️")
+track_session("Admin Performance")
+
+st.title("Performance")
+
+summary = tracer.summary()
+refresher = get_refresher()
+dataset = refresher.current
+now = time.time()
+
+st.caption(f"Collected over the last {(now - summary['since']) / 60:,.0f} minutes by this server process; percentiles cover each step's most recent calls.")
+
+# Latencies per instrumented step
+st.subheader("Latency by step")
+if summary["spans"]:
+    latencies = pd.DataFrame.from_dict(summary["spans"], orient="index")
+    latencies = latencies.rename(columns={
+        "calls": "Calls", "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)", "max_ms": "Max (ms)", "mean_ms": "Mean (ms)",
+    }).sort_values("p95 (ms)", ascending=False)
+    st.dataframe(latencies.round(2))
+else:
+    st.write("Nothing recorded yet.")
+
+# Cache hit rates
+st.subheader("Caches")
+counters = summary["counters"]
+png_requests = counters.get("charts.png_requests", 0)
+png_renders = counters.get("charts.png_renders", 0)
+caches = {
+    "Query results": get_query_cache().stats(),
+    "Exports": get_export_cache().stats(),
+    "Chart images": {
+        "hits": max(0, png_requests - png_renders),
+        "misses": png_renders,
+        "hit_rate": (png_requests - png_renders) / png_requests if png_requests else 0.0,
+    },
+}
+st.dataframe(pd.DataFrame.from_dict(caches, orient="index")[["hits", "misses", "hit_rate", "entries", "max_entries", "bytes", "max_bytes", "evictions"]])
+
+# Memory
+st.subheader("Memory")
+peak = process_memory()
+col1, col2 = st.columns(2)
+col1.metric("Process peak RSS", f"{peak / 1e6:,.0f} MB" if peak else "n/a")
+col2.metric("Shared dataset", f"{dataset.df.memory_usage(deep=True).sum() / 1e6:,.1f} MB")
+
+sessions = summary["sessions"]
+if sessions:
+    session_table = pd.DataFrame([
+        {
+            "Session": session[:8],
+            "Last page": info["page"],
+            "Reruns": info["reruns"],
+            "Idle (s)": round(now - info["last_seen"]),
+            "Session state (KB)": round(info["state_bytes"] / 1024, 1),
+        }
+        for session, info in sessions.items()
+    ]).sort_values("Idle (s)")
+    st.write(f"{len(session_table)} active sessions")
+    st.dataframe(session_table, hide_index=True)
+
+# Data refresh
+st.subheader("Data refresh")
+status = refresher.status()
+st.json({"refresher": status, "last_ingest": get_pipeline().last_stats}, expanded=False)
+
+# Export
+st.subheader("Export")
+report = {
+    "generated_at": now,
+    "summary": summary,
+    "caches": caches,
+    "process_peak_rss_bytes": peak,
+    "refresher": status,
+    "last_ingest": get_pipeline().last_stats,
+}
+col1, col2, col3 = st.columns(3)
+col1.download_button("Summary (JSON)", json.dumps(report, indent=2, default=str), "performance.json", "application/json")
+col2.download_button(
+    "Event log (JSON lines)",
+    lambda: "\n".join(json.dumps(event, default=str) for event in tracer.events()),
+    "performance-events.jsonl",
+    "application/x-ndjson",
+)
+if col3.button("Reset timings"):
+    tracer.reset()
+    st.rerun()
@@ -0,0 +1,32 @@
+"""Render page thumbnails of the sustainability guide for the Start Here page.
+
+Run after replacing static/Brief_guide_on_UC_Sustainable_Purchasing.pdf:
+
+    pip install pypdfium2
+    python scripts/build_guide_thumbnails.py
+"""
+from pathlib import Path
+
+import pypdfium2 as pdfium
+
+ROOT = Path(__file__).resolve().parent.parent
+GUIDE = ROOT / "static" / "Brief_guide_on_UC_Sustainable_Purchasing.pdf"
+OUT_DIR = ROOT / "static" / "guide_pages"
+WIDTH = 240  # px
+
+
+def main():
+    OUT_DIR.mkdir(exist_ok=True)
+    for old in OUT_DIR.glob("page-*.png"):
+        old.unlink()
+
+    pdf = pdfium.PdfDocument(GUIDE)
+    for number, page in enumerate(pdf, start=1):
+        scale = WIDTH / page.get_width()
+        image = page.render(scale=scale).to_pil()
+        image.save(OUT_DIR / f"page-{number:02d}.png", optimize=True)
+        print(f"wrote page-{number:02d}.png")
+
+
+if __name__ == "__main__":
+    main()
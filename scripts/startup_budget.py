@@ -0,0 +1,90 @@
+"""Measure cold start and rerun latency for the login and Start Here pages.
+
+Each measurement runs in a fresh interpreter so module caches don't hide
+import costs. Exits non-zero if anything goes over its budget:
+
+    python scripts/startup_budget.py
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Milliseconds, measured on a developer laptop; leave some headroom for CI.
+# cold_start is the page's own imports plus its first run; rerun is the next interaction.
+BUDGETS = {
+    "app.py": {"cold_start": 2000, "rerun": 100},
+    "pages/1_Start_Here.py": {"cold_start": 1200, "rerun": 100},
+}
+
+# Runs in the child interpreter: time the page's top-level imports, its first AppTest run and a rerun
+_PROBE = """
+import ast, json, sys, time
+from pathlib import Path
+
+page = Path(sys.argv[1])
+tree = ast.parse(page.read_text())
+imports = [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+start = time.perf_counter()
+for statement in imports:
+    exec(statement, {})
+imports_ms = (time.perf_counter() - start) * 1000
+
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file(str(page.resolve()), default_timeout=60)
+if sys.argv[2] == "logged-in":
+    at.session_state["authentication_status"] = True
+start = time.perf_counter()
+at.run()
+first_paint_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+at.run()
+rerun_ms = (time.perf_counter() - start) * 1000
+
+print(json.dumps({
+    "imports": imports_ms,
+    "first_paint": first_paint_ms,
+    "cold_start": imports_ms + first_paint_ms,
+    "rerun": rerun_ms,
+    "exceptions": [str(e.value) for e in at.exception],
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def measure(page, state):
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, page, state],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    failed = False
+    for page, budget in BUDGETS.items():
+        state = "logged-out" if page == "app.py" else "logged-in"
+        timings = measure(page, state)
+        if timings["exceptions"]:
+            print(f"{page}: raised {timings['exceptions']}")
+            failed = True
+        for metric in ("imports", "first_paint", "cold_start", "rerun"):
+            value = timings[metric]
+            line = f"{page:28} {metric:12} {value:8.0f} ms"
+            if metric in budget:
+                limit = budget[metric]
+                failed |= value > limit
+                line += f"  (budget {limit} ms)  {'ok' if value <= limit else 'OVER'}"
+            print(line)
+        print(f"{page:28} {'modules':12} {timings['modules']:8d}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
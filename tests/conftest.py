@@ -0,0 +1,81 @@
+import functools
+import http.server
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.data import BUNDLED_CSV
+from dashboard.dataset import prepare
+from dashboard.dedup import add_product_ids
+from dashboard.schema import read_csv
+
+
+def _sheet():
+    # The bundled export as the sheet serves it, plus the AASHE/PGH columns the bundled copy lacks
+    raw = pd.read_csv(BUNDLED_CSV, dtype=str)
+    rows = np.arange(len(raw))
+    return raw.assign(AASHE=np.where(rows % 2 == 0, "1", ""), PGH=np.where(rows % 3 == 0, "1", ""))
+
+
+@pytest.fixture
+def sheet():
+    """The raw sheet, all strings; a fresh copy per test, so tests may edit it."""
+    return _sheet()
+
+
+@pytest.fixture(scope="session")
+def bundled():
+    """The sheet parsed into the schema, with product ids."""
+    return add_product_ids(read_csv(io.StringIO(_sheet().to_csv(index=False))))
+
+
+@pytest.fixture(scope="session")
+def dataset(bundled):
+    return prepare(bundled, {})
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_request(self, code="-", size="-"):
+        self.server.statuses.append(int(code))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Site:
+    """Files served over HTTP from a temporary directory; ``statuses`` lists the response codes sent."""
+
+    def __init__(self, root, server):
+        self.root = root
+        self.base_url = f"http://127.0.0.1:{server.server_port}"
+        self.statuses = server.statuses
+
+    def url(self, name):
+        return f"{self.base_url}/{name}"
+
+    def publish(self, name, text):
+        path = self.root / name
+        previous = path.stat().st_mtime if path.exists() else 0
+        path.write_text(text)
+        # Last-Modified has one-second resolution, so keep every version strictly newer than the last
+        stamp = max(path.stat().st_mtime, previous + 1)
+        os.utime(path, (stamp, stamp))
+
+    def remove(self, name):
+        (self.root / name).unlink()
+
+
+@pytest.fixture
+def web(tmp_path):
+    root = tmp_path / "www"
+    root.mkdir()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(root)))
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield Site(root, server)
+    server.shutdown()
+    server.server_close()
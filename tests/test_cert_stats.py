@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from dashboard.campuses import campus_cols, campus_name_map
+from dashboard.certifications import sustainability_dict
+from dashboard.schema import flag
+
+
+def products(df, rows):
+    return df.loc[rows, 'product_id'].nunique()
+
+
+def test_totals_count_each_product_once(dataset):
+    df = dataset.df
+    expected = {sustainability_dict[c]: products(df, flag(df, c)) for c in dataset.cert_cols}
+    assert dataset.cert_stats.cert_counts() == {name: n for name, n in expected.items() if n}
+
+
+def test_campus_by_cert(dataset):
+    df, table = dataset.df, dataset.cert_stats.campus_by_cert()
+    for c in campus_cols:
+        for cert in dataset.cert_cols:
+            expected = products(df, flag(df, c) & flag(df, cert))
+            assert table.loc[campus_name_map[c], sustainability_dict[cert]] == expected, (c, cert)
+
+
+def test_distributor_breakdown(dataset):
+    df, breakdown = dataset.df, dataset.cert_stats.distributor_breakdown()
+    for name, rows in df.groupby('Distributor', observed=True).groups.items():
+        frame = df.loc[rows]
+        assert breakdown.loc[name, "Products"] == frame['product_id'].nunique()
+        for cert in dataset.cert_cols:
+            assert breakdown.loc[name, sustainability_dict[cert]] == products(frame, flag(frame, cert)), (name, cert)
+
+
+@pytest.mark.parametrize("rows", [
+    lambda df: df['Category'] == "Produce",
+    lambda df: flag(df, "UCLA") | flag(df, "UCB"),
+    lambda df: ~flag(df, "OG"),
+    lambda df: np.zeros(len(df), dtype=bool),
+], ids=["category", "campuses", "not certified", "empty"])
+def test_selection_counts_its_own_rows(dataset, rows):
+    df = dataset.df
+    rows = np.asarray(rows(df))
+    expected = {sustainability_dict[c]: products(df, rows & flag(df, c)) for c in dataset.cert_cols}
+    counts = dataset.cert_stats.cert_counts(positions=np.flatnonzero(rows))
+    assert counts == {name: n for name, n in expected.items() if n}
+
+
+def test_counts_distinct_products(dataset):
+    assert dataset.cert_stats.n_products == dataset.df['product_id'].nunique()
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from dashboard.dedup import _one_typo, name_tokens, product_ids
+
+
+def ids_of(df, *names):
+    return [df.loc[df['ProductName'] == name, 'product_id'].unique().tolist() for name in names]
+
+
+def listings(*rows):
+    return pd.DataFrame(rows, columns=["Supplier", "ProductName", "Category"])
+
+
+def test_bundled_typo_across_categories_is_not_merged(bundled):
+    # Produce vs Snacks, and the edit is on the first letter
+    jazz, razz = ids_of(bundled, "bar Jambar Jazzleberry", "bar Jambar Razzleberry")
+    assert len(jazz) == len(razz) == 1 and jazz != razz
+
+
+def test_bundled_parenthesized_qualifier_is_kept(bundled):
+    plain, organic = ids_of(bundled, "BABY KALE 3#", "BABY KALE 3# (ORGANIC)")
+    assert plain != organic
+
+
+def test_bundled_near_duplicates_are_merged(bundled):
+    upper, lower = ids_of(bundled, "Natural 22-24% Cocoa Powder", "Natural 22-24% cocoa powder")
+    assert upper == lower
+    plural, singular = ids_of(bundled, "Iwon Organics Spicy Sweet Peppers", "Iwon Organics Spicy Sweet pepper")
+    assert plural == singular
+
+
+def test_one_typo_rules():
+    assert not _one_typo("milk", "silk")  # too short, and the first letter differs
+    assert not _one_typo("jazzleberry", "razzleberry")
+    assert _one_typo("chocolate", "chocolte")
+    assert _one_typo("chocolate", "chocolaet")
+    assert not _one_typo("chocolate", "choclaet")
+
+
+def test_restating_parentheticals_are_dropped():
+    assert name_tokens("Ben & Jerrys (B&J) Ice Cream Cherry Garcia Pint (pt)") == \
+        name_tokens("Ben & Jerry's Cherry Garcia Ice Cream Pint")
+    assert name_tokens("Organic Orange Juice (OG)") == name_tokens("Organic Orange Juice")
+    assert name_tokens("Fresh Orange Juice (OG)") != name_tokens("Fresh Orange Juice")
+    assert name_tokens("Coffee (Fair Trade)") != name_tokens("Coffee")
+    assert name_tokens("Turkey Ground (5lb)") != name_tokens("Turkey Ground")
+
+
+def test_merge_and_no_merge_cases():
+    df = listings(
+        ("Acme Inc", "Organic Chocolate Bar", "Snacks"),
+        ("Acme", "organic chocolte bar", "Snacks"),         # typo, same supplier and category: merged
+        ("Acme", "Organic Chocolatte Bar", "Produce"),      # typo in another category: separate
+        ("Other Co", "Organic Chocolate Bar", "Snacks"),    # another supplier: separate
+        ("Acme", "Organic Chocolate Bar 12oz", "Snacks"),   # sizes must match exactly
+        ("Acme", "Organic Chocolate Bar 16oz", "Snacks"),
+        ("Acme", "Oat Silk", "Dairy"),
+        ("Acme", "Oat Milk", "Dairy"),                      # short words must match exactly
+    )
+    ids = product_ids(df).tolist()
+    assert ids[0] == ids[1]
+    assert len({ids[0], ids[2], ids[3], ids[4], ids[5]}) == 5
+    assert ids[6] != ids[7]
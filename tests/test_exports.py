@@ -0,0 +1,11 @@
+import pytest
+
+from dashboard import exports
+from dashboard.exports import to_bytes
+
+
+def test_excel_refuses_more_rows_than_a_sheet_holds(bundled, monkeypatch):
+    monkeypatch.setattr(exports, "EXCEL_MAX_ROWS", 10)
+    assert to_bytes(bundled.head(10), "Excel (XLSX)")[:2] == b"PK"
+    with pytest.raises(ValueError, match="don't fit in an Excel sheet"):
+        to_bytes(bundled.head(11), "Excel (XLSX)")
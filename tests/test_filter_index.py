@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.campuses import region_map
+from dashboard.certifications import aggregator_columns
+from dashboard.filter_index import Filters
+
+
+def has(raw, col):
+    if col not in raw.columns:
+        return pd.Series(False, index=raw.index)
+    return raw[col].eq("1")
+
+
+def combine(masks, match="any"):
+    return np.logical_and.reduce(masks) if match == "all" else np.logical_or.reduce(masks)
+
+
+def reference(raw, filters):
+    """Row positions matching ``filters``, evaluated directly on the CSV columns."""
+    mask = combine([has(raw, col) for col in aggregator_columns[filters.aggregator]])
+    if filters.categories:
+        mask &= raw['Category'].isin(filters.categories)
+    if filters.regions:
+        mask &= combine([has(raw, c) for region in filters.regions for c in region_map.get(region, [])])
+    if filters.campuses:
+        mask &= combine([has(raw, c) for c in filters.campuses], filters.campus_match)
+    if filters.certs:
+        mask &= combine([has(raw, c) for c in filters.certs], filters.cert_match)
+    mask &= ~raw['Category'].isin(filters.exclude_categories)
+    for col in filters.exclude_campuses + filters.exclude_certs:
+        mask &= ~has(raw, col)
+    return np.flatnonzero(mask)
+
+
+CASES = [
+    Filters(),
+    Filters(aggregator="AASHE STARS"),
+    Filters(aggregator="Practice Greenhealth", categories=("Produce", "Snacks")),
+    Filters(categories=("Produce", "No such category")),
+    Filters(regions=("SoCal",)),
+    Filters(regions=("SoCal", "Central")),
+    Filters(regions=("SoCal",), campuses=("UCLA",)),
+    Filters(regions=("NorCal",), campuses=("UCB", "UCD_H"), campus_match="all"),
+    Filters(campuses=("UCLA", "UCB"), campus_match="all"),
+    Filters(certs=("OG", "FT")),
+    Filters(certs=("OG", "FT"), cert_match="all"),
+    Filters(certs=("OG", "BAP"), cert_match="all"),
+    Filters(exclude_categories=("Produce",), exclude_campuses=("UCLA",), exclude_certs=("OG",)),
+    Filters(aggregator="AASHE STARS", categories=("Produce",), regions=("NorCal",), campuses=("UCB", "UCD_H"),
+            certs=("OG",), exclude_campuses=("UCLA",)),
+]
+
+
+@pytest.mark.parametrize("filters", CASES, ids=lambda f: f.describe())
+def test_matches_pandas(sheet, dataset, filters):
+    np.testing.assert_array_equal(dataset.filter_index.select(filters), reference(sheet, filters))
+
+
+def test_regions_and_campuses_are_anded(dataset):
+    index = dataset.filter_index
+    # UCD_H is in NorCal, so nothing is both in SoCal and bought by UCD_H
+    assert len(index.select(Filters(regions=("SoCal",), campuses=("UCD_H",)))) == 0
+    ucla = index.select(Filters(campuses=("UCLA",)))
+    assert len(ucla) > 0
+    np.testing.assert_array_equal(index.select(Filters(regions=("SoCal",), campuses=("UCLA",))), ucla)
+
+
+def test_describe_keeps_regions_separate():
+    filters = Filters(regions=("SoCal",), campuses=("UCB", "UCLA"), campus_match="all")
+    assert filters.describe() == "SoCal AND (UCB AND UCLA)"
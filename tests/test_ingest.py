@@ -0,0 +1,99 @@
+import csv
+
+import pytest
+
+from dashboard import ingest
+from dashboard.ingest import IngestPipeline, Source
+
+PARTS = {"a": slice(0, 300), "b": slice(300, 600), "c": slice(600, None)}
+
+
+@pytest.fixture
+def pipeline(tmp_path, web, sheet, monkeypatch):
+    """Serve the sheet split into three sources; ``pipeline()`` makes a pipeline over them (a restart makes another)."""
+    monkeypatch.setattr(ingest, "SOURCE_CACHE_DIR", tmp_path / "sources")
+    for name, rows in PARTS.items():
+        web.publish(f"{name}.csv", sheet.iloc[rows].to_csv(index=False))
+    return lambda: IngestPipeline([Source(name, web.url(f"{name}.csv")) for name in PARTS])
+
+
+def fetch(pipeline, meta):
+    update = pipeline.update(meta)
+    return update, pipeline.last_stats["statuses"]
+
+
+def test_first_fetch_merges_every_source(pipeline, sheet):
+    (df, meta), statuses = fetch(pipeline(), {})
+    assert statuses == {"a": "changed", "b": "changed", "c": "changed"}
+    assert df['ProductName'].tolist() == sheet['ProductName'].tolist()
+    assert 'product_id' in df.columns and set(meta["sources"]) == set(PARTS)
+
+
+def test_unmodified_sources_answer_304(pipeline, web):
+    pipeline = pipeline()
+    _, meta = pipeline.update({})
+    web.statuses.clear()
+    update, statuses = fetch(pipeline, meta)
+    assert update is None and set(statuses.values()) == {"unchanged"}
+    assert web.statuses == [304, 304, 304]
+
+
+def test_same_bytes_are_unchanged_by_content_hash(pipeline, web):
+    pipeline = pipeline()
+    _, meta = pipeline.update({})
+    web.publish("a.csv", (web.root / "a.csv").read_text())  # newer date, same bytes
+    web.statuses.clear()
+    update, statuses = fetch(pipeline, meta)
+    assert update is None and statuses["a"] == "unchanged" and sorted(web.statuses) == [200, 304, 304]
+
+
+def test_same_rows_reformatted_are_not_merged(pipeline, web, sheet):
+    pipeline = pipeline()
+    _, meta = pipeline.update({})
+    web.publish("b.csv", sheet.iloc[PARTS["b"]].to_csv(index=False, quoting=csv.QUOTE_ALL))
+    update, statuses = fetch(pipeline, meta)
+    assert update is None and statuses["b"] == "reparsed"
+
+
+def test_changed_rows_are_merged(pipeline, web, sheet):
+    pipeline = pipeline()
+    _, meta = pipeline.update({})
+    sheet.loc[400, 'ProductName'] = "Renamed product"
+    web.publish("b.csv", sheet.iloc[PARTS["b"]].to_csv(index=False))
+    (df, new_meta), statuses = fetch(pipeline, meta)
+    assert statuses == {"a": "unchanged", "b": "changed", "c": "unchanged"}
+    assert new_meta["version"] != meta["version"] and df['ProductName'].iloc[400] == "Renamed product"
+    assert len(df) == len(sheet)
+
+
+def test_failed_source_keeps_its_last_frame(pipeline, web, sheet):
+    pipeline = pipeline()
+    _, meta = pipeline.update({})
+    web.remove("c.csv")
+    sheet.loc[0, 'ProductName'] = "Renamed product"
+    web.publish("a.csv", sheet.iloc[PARTS["a"]].to_csv(index=False))
+    (df, _), statuses = fetch(pipeline, meta)
+    assert statuses["c"] == "failed" and statuses["a"] == "changed"
+    assert df['ProductName'].tolist() == sheet['ProductName'].tolist()
+
+
+def test_never_seen_source_fails_the_refresh(pipeline, web):
+    web.remove("b.csv")
+    with pytest.raises(RuntimeError, match="source 'b' is unavailable"):
+        pipeline().update({})
+
+
+def test_restart_reuses_cached_sources(pipeline, web, sheet):
+    _, meta = pipeline().update({})
+    restarted = pipeline()
+    web.statuses.clear()
+    update, statuses = fetch(restarted, meta)
+    assert update is None and web.statuses == [304, 304, 304]
+
+    # A source that fails after the restart is still merged from its cached frame
+    web.remove("a.csv")
+    sheet.loc[700, 'ProductName'] = "Renamed product"
+    web.publish("c.csv", sheet.iloc[PARTS["c"]].to_csv(index=False))
+    (df, _), statuses = fetch(restarted, meta)
+    assert statuses == {"a": "failed", "b": "unchanged", "c": "changed"}
+    assert df['ProductName'].tolist() == sheet['ProductName'].tolist()
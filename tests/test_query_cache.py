@@ -0,0 +1,26 @@
+import numpy as np
+
+from dashboard.query_cache import QueryCache
+
+
+def test_evicts_oldest_past_byte_budget():
+    cache = QueryCache(maxsize=10, max_bytes=1000)
+    for key in "abc":
+        cache.get_or_compute("v1", key, lambda: np.zeros(50, dtype=np.int64))  # 400 bytes each
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 800 and stats["evictions"] == 1
+    cache.get_or_compute("v1", "b", lambda: None)
+    assert cache.hits == 1
+
+
+def test_skips_values_over_budget():
+    cache = QueryCache(max_bytes=10)
+    assert cache.get_or_compute("v1", "big", lambda: b"x" * 11) == b"x" * 11
+    assert cache.stats()["entries"] == 0
+
+
+def test_new_version_drops_entries():
+    cache = QueryCache()
+    cache.get_or_compute("v1", "a", lambda: b"abc")
+    cache.get_or_compute("v2", "b", lambda: b"de")
+    assert cache.stats()["entries"] == 1 and cache.nbytes == 2
@@ -0,0 +1,95 @@
+import io
+
+import pytest
+
+from dashboard import ingest, refresh
+from dashboard.campuses import campus_cols
+from dashboard.certifications import sustainability_dict
+from dashboard.dataset import prepare
+from dashboard.ingest import IngestPipeline, Source
+from dashboard.refresh import Refresher, validate
+from dashboard.schema import read_csv
+
+
+def parse(raw):
+    return read_csv(io.StringIO(raw.to_csv(index=False)))
+
+
+@pytest.fixture
+def refresher(tmp_path, web, sheet, monkeypatch):
+    """A Refresher over one served sheet; snapshot saves are recorded in ``refresher.saved``."""
+    monkeypatch.setattr(ingest, "SOURCE_CACHE_DIR", tmp_path / "sources")
+    monkeypatch.setattr(ingest, "_pipeline", IngestPipeline([Source("sheet", web.url("sheet.csv"))]))
+    saved = []
+    monkeypatch.setattr(refresh, "save_snapshot", lambda df, meta: saved.append(meta["version"]))
+
+    web.publish("sheet.csv", sheet.to_csv(index=False))
+    df, meta = ingest.fetch_update({})
+    refresher = Refresher(prepare, df, meta)
+    refresher.saved = saved
+    return refresher
+
+
+@pytest.mark.parametrize("dropped, error", [
+    (["Standard"], "missing columns: Standard"),
+    (campus_cols, "no campus flags"),
+    (["AASHE", "PGH"], "no AASHE/PGH flags"),
+    (list(sustainability_dict), "no certification flags"),
+], ids=["column", "campuses", "aggregators", "certifications"])
+def test_validate_rejects_lost_columns(sheet, dropped, error):
+    update = parse(sheet.drop(columns=[c for c in dropped if c in sheet.columns]))
+    with pytest.raises(ValueError, match=error):
+        validate(update, parse(sheet))
+
+
+def test_validate_rejects_shrunk_export(sheet):
+    with pytest.raises(ValueError, match="rows, down from"):
+        validate(parse(sheet.head(len(sheet) // 3)), parse(sheet))
+    validate(parse(sheet.head(len(sheet) - 10)), parse(sheet))
+
+
+def test_unchanged_sheet_keeps_dataset(refresher):
+    version = refresher.current.version
+    refresher.refresh_once()
+    assert refresher.current.version == version
+    assert refresher.last_error is None and refresher.swaps == 0 and refresher.saved == []
+
+
+def test_changed_sheet_is_swapped_in_and_saved(refresher, web, sheet):
+    old = refresher.current
+    sheet.loc[0, 'ProductName'] = "Renamed product"
+    web.publish("sheet.csv", sheet.to_csv(index=False))
+    refresher.refresh_once()
+    assert refresher.last_error is None and refresher.swaps == 1
+    assert refresher.current is not old and refresher.saved == [refresher.current.version]
+    assert "Renamed product" in refresher.current.df['ProductName'].tolist()
+
+
+def test_bad_update_keeps_last_good_dataset(refresher, web, sheet):
+    old = refresher.current
+    web.publish("sheet.csv", sheet.drop(columns=["AASHE", "PGH"]).to_csv(index=False))
+    refresher.refresh_once()
+    assert "AASHE/PGH" in refresher.last_error
+    assert refresher.current is old and refresher.swaps == 0 and refresher.saved == []
+
+
+def test_update_that_fails_to_prepare_is_not_saved(refresher, web, sheet):
+    old = refresher.current
+
+    def broken(df, meta):
+        raise RuntimeError("prepare failed")
+
+    refresher._prepare = broken
+    sheet.loc[0, 'ProductName'] = "Renamed product"
+    web.publish("sheet.csv", sheet.to_csv(index=False))
+    refresher.refresh_once()
+    assert "prepare failed" in refresher.last_error
+    assert refresher.current is old and refresher.saved == []
+
+
+def test_unreachable_source_keeps_dataset(refresher, web):
+    old = refresher.current
+    web.remove("sheet.csv")
+    refresher.refresh_once()
+    assert refresher.last_error is None  # a known source that fails keeps its last data
+    assert refresher.current is old and refresher.saved == []
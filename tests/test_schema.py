@@ -0,0 +1,36 @@
+import io
+
+import pandas as pd
+
+from dashboard.schema import apply_schema, concat_frames, read_csv, unpack_flags
+
+SHEET = """Distributor,Supplier,ProductName,Category,Standard,UCLA,UCB,OG,FT,Internal_ID_Reference_Number
+Sysco,Acme,Organic Milk,Milk,USDA Organic,1,,1,,00123
+Sysco,Acme,Coffee,Coffee/Tea,Fair Trade,,1,,1,00456
+"""
+
+
+def test_unpack_restores_source_layout():
+    df = read_csv(io.StringIO(SHEET))
+    assert "UCLA" not in df.columns
+    out = unpack_flags(df.assign(derived="x"))
+    assert list(out.columns) == list(pd.read_csv(io.StringIO(SHEET)).columns) + ["derived"]
+    assert out["UCLA"].tolist() == [1, 0] and out["FT"].tolist() == [0, 1]
+    assert out["Internal_ID_Reference_Number"].tolist() == ["00123", "00456"]
+
+
+def test_layout_survives_slicing_and_concat():
+    df = read_csv(io.StringIO(SHEET))
+    other = apply_schema(pd.DataFrame({"Distributor": ["UNFI"], "ProductName": ["Tea"], "UCM": [1]}))
+    merged = concat_frames([df, other])
+    out = unpack_flags(merged.take([2, 0]))
+    assert list(out.columns) == list(pd.read_csv(io.StringIO(SHEET)).columns) + ["UCM"]
+    assert out["UCM"].tolist() == [1, 0]
+
+
+def test_unpack_without_layout_appends_every_flag():
+    df = read_csv(io.StringIO(SHEET))
+    df.attrs.clear()
+    out = unpack_flags(df)
+    assert list(out.columns[:5]) == ["Distributor", "Supplier", "ProductName", "Category", "Standard"]
+    assert {"UCLA", "UCSD_H", "OG", "AASHE"} <= set(out.columns)
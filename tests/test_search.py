@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.search import MIN_SCORE, TrigramIndex, normalize, trigrams
+
+
+def frame(names, suppliers=None):
+    return pd.DataFrame({
+        "ProductName": names,
+        "Supplier": suppliers or ["Acme"] * len(names),
+        "Distributor": ["Sysco"] * len(names),
+    })
+
+
+def coverage(query, value):
+    grams = trigrams(normalize(query))
+    return len(grams & trigrams(normalize(value))) / len(grams)
+
+
+def test_exact_and_typo_matches():
+    index = TrigramIndex(frame(["Organic Whole Milk", "Fair Trade Coffee", "Greek Yogurt"]))
+    assert list(index.search("organic whole milk")) == [0]
+    assert list(index.search("orgnic whole mlk")) == [0]
+    assert list(index.search("cofee")) == [1]
+
+
+def test_shorter_values_made_of_the_query_rank_first():
+    index = TrigramIndex(frame(["Organic Whole Milk Half Gallon", "Milk", "Oat Milk"]))
+    result = list(index.search("milk"))
+    assert result[0] == 1
+    assert set(result) == {0, 1, 2}
+
+
+def test_min_score_cutoff():
+    names = ["Strawberry Jam", "Strawberries", "Raspberry Jam", "Blueberry Muffin", "Straw Hat"]
+    index = TrigramIndex(frame(names))
+    query = "strawberry jam"
+    expected = {i for i, name in enumerate(names) if coverage(query, name) >= MIN_SCORE}
+    assert set(index.search(query)) == expected
+    assert 0 in expected and 3 not in expected
+    # A stricter cutoff only keeps values holding every query trigram
+    assert list(index.search(query, min_score=1.0)) == [0]
+
+
+def test_row_matching_several_columns_is_returned_once():
+    index = TrigramIndex(frame(["Acme Granola", "Oats"], suppliers=["Acme", "Acme"]))
+    result = index.search("acme")
+    assert sorted(result) == [0, 1]
+    assert len(result) == len(set(result))
+
+
+def test_within_and_empty_query():
+    index = TrigramIndex(frame(["Organic Milk", "Organic Eggs", "Organic Milk"]))
+    assert list(index.search("organic milk", within=np.array([1, 2]))) == [2, 1]
+    assert list(index.search("organic milk", within=np.array([0]))) == [0]
+    assert len(index.search("  ?! ")) == 0
+    assert len(index.search("zzzzqqq")) == 0